@@ -2,14 +2,22 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
+import io
+import multiprocessing
+import os
 import re
+import shutil
+import sys
 import unicodedata
 import zlib
-from collections import Counter, defaultdict
+from pathlib import Path
+from functools import lru_cache
+from collections.abc import Iterator
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from difflib import SequenceMatcher
 
+import numpy as np
 from psycopg2.extras import execute_values
 
 from db import get_connection as get_herodian_connection
@@ -18,10 +26,32 @@ from stephanos_db import get_connection as get_stephanos_connection
 
 GREEK_WORD_RE = re.compile(r"[\u0370-\u03FF\u1F00-\u1FFF]+", flags=re.UNICODE)
 
+# str.translate table deleting every combining mark (accents, breathings, iota subscript, ...).
+COMBINING_MARKS_TABLE = dict.fromkeys(
+    cp for cp in range(sys.maxunicode + 1) if unicodedata.combining(chr(cp))
+)
 
+
+NORMALIZE_CACHE_SIZE = 131072
+
+# Rows fetched per round-trip by the server-side (named) cursors.
+STREAM_ITERSIZE = 1000
+
+# Bump whenever the letter/word normalization changes, so persisted normalized texts are recomputed.
+NORMALIZATION_VERSION = "n2"
+
+# Bump whenever the shingle hashing or the saved index layout changes, so cached indexes are rebuilt.
+SHINGLE_INDEX_FORMAT = "s1"
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
 def strip_diacritics(text: str) -> str:
-    decomposed = unicodedata.normalize("NFD", text or "")
-    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    if not text:
+        return ""
+    if text.isascii():
+        return text
+    # normalize() returns its input unchanged when the NFD quick-check passes.
+    return unicodedata.normalize("NFD", text).translate(COMBINING_MARKS_TABLE)
 
 
 def _is_greek_letter(ch: str) -> bool:
@@ -37,47 +67,113 @@ def _extend_end_to_include_combining(text: str, end: int) -> int:
     return end
 
 
-def normalize_greek_letters_with_map(text: str) -> tuple[str, list[int]]:
+class _FoldTable(dict):
+    """str.translate table mapping any code point it has no entry for to `default` (caching the miss)."""
+
+    def __init__(self, default: str | None) -> None:
+        super().__init__()
+        self.default = default
+
+    def __missing__(self, cp: int) -> str | None:
+        self[cp] = self.default
+        return self.default
+
+
+def _build_greek_fold_table() -> _FoldTable:
+    table = _FoldTable(None)
+    for cp in (*range(0x0370, 0x0400), *range(0x1F00, 0x2000)):
+        ch = chr(cp)
+        if not _is_greek_letter(ch):
+            table[cp] = None
+            continue
+        base = "".join(
+            base_ch
+            for base_ch in strip_diacritics(ch).lower().replace("ς", "σ")
+            if _is_greek_letter(base_ch)
+        )
+        # Every Greek letter folds to at most one base letter, which keeps norm_map one-to-one.
+        assert len(base) <= 1, (hex(cp), base)
+        table[cp] = base or None
+    return table
+
+
+# Per-code-point fold of a Greek letter to its lowercase base letter (diacritics removed,
+# final sigma → sigma); everything else is deleted. Decomposition is baked into the entries,
+# so one translate() pass over the original text replaces NFD + strip + lower + filter.
+GREEK_FOLD_TABLE = _build_greek_fold_table()
+
+
+def _build_greek_word_fold_table() -> _FoldTable:
+    table = _FoldTable(" ")
+    table.update(COMBINING_MARKS_TABLE)
+    # Besides the Greek blocks, every code point that NFD changes gets an entry: singleton
+    # decompositions can land in Greek (U+2126 OHM SIGN → Ω) and some decompose into
+    # combining marks only (Tibetan vowel signs), which the strip then deletes outright.
+    decomposing = (
+        cp for cp in range(sys.maxunicode + 1) if not unicodedata.is_normalized("NFD", chr(cp))
+    )
+    for cp in (*range(0x0370, 0x0400), *range(0x1F00, 0x2000), *decomposing):
+        base = strip_diacritics(chr(cp)).lower().replace("ς", "σ")
+        table[cp] = "".join(base_ch if GREEK_WORD_RE.fullmatch(base_ch) else " " for base_ch in base)
+    return table
+
+
+# Word-level counterpart of GREEK_FOLD_TABLE: combining marks are deleted, characters that
+# fold into the GREEK_WORD_RE ranges are kept (folded), and everything else becomes a space,
+# so splitting the translated text yields the same words as findall over the stripped text.
+GREEK_WORD_FOLD_TABLE = _build_greek_word_fold_table()
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def normalize_greek_letters_with_map(text: str) -> tuple[str, tuple[int, ...]]:
     """
     Normalize Greek text to base letters (lowercased, diacritics removed, final sigma → sigma),
     returning (normalized_letters, norm_index_to_original_index).
+
+    Results are memoized, so the returned map is an immutable tuple.
     """
     if not text:
-        return "", []
-    norm_chars: list[str] = []
-    norm_map: list[int] = []
-    for idx, ch in enumerate(text):
-        if not _is_greek_letter(ch):
-            continue
-        base = strip_diacritics(ch).lower().replace("ς", "σ")
-        for base_ch in base:
-            if not _is_greek_letter(base_ch):
-                continue
-            norm_chars.append(base_ch)
-            norm_map.append(idx)
-    return "".join(norm_chars), norm_map
+        return "", ()
+    norm = text.translate(GREEK_FOLD_TABLE)
+    norm_map = tuple(idx for idx, ch in enumerate(text) if GREEK_FOLD_TABLE[ord(ch)] is not None)
+    return norm, norm_map
 
 
 def normalize_greek_letters(text: str) -> str:
     return normalize_greek_letters_with_map(text)[0]
 
 
-def normalize_greek_words(text: str) -> list[str]:
-    base = strip_diacritics(text).lower().replace("ς", "σ")
-    return GREEK_WORD_RE.findall(base)
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def normalize_greek_words(text: str) -> tuple[str, ...]:
+    return tuple(text.translate(GREEK_WORD_FOLD_TABLE).split())
 
 
 def crc32_u32(value: str) -> int:
     return zlib.crc32(value.encode("utf-8")) & 0xFFFFFFFF
 
 
-def char_shingles(text: str, k: int) -> set[int]:
-    if not text or k <= 0 or len(text) < k:
+def encode_letters(text: str) -> bytes:
+    # Normalized letters are all in the BMP, so UTF-16 gives a fixed 2 bytes per char and
+    # a k-letter window is always a 2k-byte slice.
+    return text.encode("utf-16-le")
+
+
+def char_shingles_bytes(data: bytes, k: int) -> set[int]:
+    """
+    Hash every k-letter window of `data` (letters as produced by encode_letters).
+    """
+    width = 2 * k
+    if k <= 0 or len(data) < width:
         return set()
-    return {crc32_u32(text[i : i + k]) for i in range(0, len(text) - k + 1)}
+    crc32 = zlib.crc32
+    return {crc32(data[i : i + width]) for i in range(0, len(data) - width + 1, 2)}
 
 
-def word_shingles(words: list[str], k: int) -> set[int]:
+def char_shingles(text: str, k: int) -> set[int]:
+    return char_shingles_bytes(encode_letters(text), k)
+
+
+def word_shingles(words: tuple[str, ...], k: int) -> set[int]:
     if not words or k <= 0 or len(words) < k:
         return set()
     out: set[int] = set()
@@ -86,17 +182,101 @@ def word_shingles(words: list[str], k: int) -> set[int]:
     return out
 
 
+@dataclass(frozen=True)
+class SuffixAutomaton:
+    """
+    Suffix automaton over one sequence (letters or words), stored as parallel lists per state.
+
+    `first_end[s]` is the end index of the first occurrence of the strings in state `s`.
+    """
+
+    transitions: list[dict]
+    link: list[int]
+    length: list[int]
+    first_end: list[int]
+
+
+def build_suffix_automaton(seq) -> SuffixAutomaton:
+    transitions: list[dict] = [{}]
+    link = [-1]
+    length = [0]
+    first_end = [-1]
+    last = 0
+    for pos, token in enumerate(seq):
+        cur = len(transitions)
+        transitions.append({})
+        link.append(0)
+        length.append(length[last] + 1)
+        first_end.append(pos)
+        p = last
+        while p != -1 and token not in transitions[p]:
+            transitions[p][token] = cur
+            p = link[p]
+        if p != -1:
+            q = transitions[p][token]
+            if length[p] + 1 == length[q]:
+                link[cur] = q
+            else:
+                clone = len(transitions)
+                transitions.append(dict(transitions[q]))
+                link.append(link[q])
+                length.append(length[p] + 1)
+                first_end.append(first_end[q])
+                while p != -1 and transitions[p].get(token) == q:
+                    transitions[p][token] = clone
+                    p = link[p]
+                link[q] = clone
+                link[cur] = clone
+        last = cur
+    return SuffixAutomaton(transitions=transitions, link=link, length=length, first_end=first_end)
+
+
+def longest_common_block_sam(sam: SuffixAutomaton, b) -> tuple[int, int, int]:
+    """
+    Longest common contiguous block between the automaton's sequence `a` and `b`, in O(len(b)).
+
+    Returns (a_start, b_start, size) with the same tie-breaking as
+    SequenceMatcher.find_longest_match: earliest in `a`, then earliest in `b`.
+    """
+    transitions = sam.transitions
+    link = sam.link
+    length = sam.length
+    first_end = sam.first_end
+
+    state = 0
+    cur_len = 0
+    best_len = 0
+    best_a = 0
+    best_b = 0
+    for j, token in enumerate(b):
+        # One dict probe per state visited (the root has no suffix link to follow).
+        nxt = transitions[state].get(token)
+        while nxt is None and state:
+            state = link[state]
+            cur_len = length[state]
+            nxt = transitions[state].get(token)
+        if nxt is None:
+            continue
+        state = nxt
+        cur_len += 1
+        if cur_len < best_len:
+            continue
+        a_start = first_end[state] - cur_len + 1
+        if cur_len > best_len or a_start < best_a:
+            best_len = cur_len
+            best_a = a_start
+            best_b = j - cur_len + 1
+    return best_a, best_b, best_len
+
+
 def longest_common_block(a, b) -> tuple[int, int, int]:
     if not a or not b:
         return 0, 0, 0
-    match = SequenceMatcher(None, a, b, autojunk=False).find_longest_match(
-        0, len(a), 0, len(b)
-    )
-    return match.a, match.b, match.size
+    return longest_common_block_sam(build_suffix_automaton(a), b)
 
 
 def map_norm_span_to_original(
-    *, text: str, norm_map: list[int], norm_start: int, norm_size: int
+    *, text: str, norm_map: tuple[int, ...], norm_start: int, norm_size: int
 ) -> tuple[int | None, int | None]:
     if norm_size <= 0:
         return None, None
@@ -109,23 +289,108 @@ def map_norm_span_to_original(
 
 
 @dataclass(frozen=True)
-class StephanosEntry:
-    lemma_id: int
-    headword: str | None
-    meineke_id: str | None
-    text_body: str
-    norm_letters: str
-    norm_letters_map: list[int]
-    norm_words: list[str]
+class StephanosTable:
+    """
+    Current Meineke entries in columnar form: column[i] describes the entry at dense index i.
+
+    Inverted indexes and hit counts are keyed by dense index; `lemma_ids` maps back to DB ids.
+    """
+
+    lemma_ids: np.ndarray
+    headwords: list[str | None]
+    meineke_ids: list[str | None]
+    text_bodies: list[str]
+    norm_letters: list[str]
+    norm_letters_maps: list[tuple[int, ...]]
+    norm_words: list[tuple[str, ...]]
+    letters_bytes: list[bytes]
+    letter_lens: np.ndarray
+    word_lens: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.text_bodies)
+
+
+def load_normalized_texts(conn) -> dict[int, tuple[str, str, tuple[int, ...], tuple[str, ...]]]:
+    """
+    Load persisted normalizations of Stephanos texts for the current NORMALIZATION_VERSION.
+
+    Returns {lemma_id: (text_md5, norm_letters, norm_letters_map, norm_words)}.
+    """
+    cached = {}
+    with conn.cursor(name="stephanos_normalized_texts_stream") as cur:
+        cur.itersize = STREAM_ITERSIZE
+        cur.execute(
+            """
+            SELECT stephanos_lemma_id, text_md5, norm_letters, norm_letters_map, norm_words
+            FROM stephanos_normalized_texts
+            WHERE normalization_version = %s
+            """,
+            (NORMALIZATION_VERSION,),
+        )
+        for lemma_id, text_md5, letters, letters_map, words in cur:
+            cached[int(lemma_id)] = (text_md5, letters, tuple(letters_map), tuple(words))
+    return cached
+
+
+def store_normalized_texts(conn, rows: list[tuple[int, str, str, tuple[int, ...], tuple[str, ...]]]) -> None:
+    """
+    Upsert (lemma_id, text_md5, norm_letters, norm_letters_map, norm_words) rows.
+    """
+    if not rows:
+        return
+    with conn.cursor() as cur:
+        execute_values(
+            cur,
+            """
+            INSERT INTO stephanos_normalized_texts
+              (stephanos_lemma_id, normalization_version, text_md5,
+               norm_letters, norm_letters_map, norm_words, computed_at)
+            VALUES %s
+            ON CONFLICT (stephanos_lemma_id) DO UPDATE SET
+              normalization_version = EXCLUDED.normalization_version,
+              text_md5 = EXCLUDED.text_md5,
+              norm_letters = EXCLUDED.norm_letters,
+              norm_letters_map = EXCLUDED.norm_letters_map,
+              norm_words = EXCLUDED.norm_words,
+              computed_at = EXCLUDED.computed_at
+            """,
+            [
+                (lemma_id, NORMALIZATION_VERSION, text_md5, letters, list(letters_map), list(words))
+                for lemma_id, text_md5, letters, letters_map, words in rows
+            ],
+            template="(%s, %s, %s, %s, %s::integer[], %s::text[], NOW())",
+            page_size=500,
+        )
+
 
+def fetch_stephanos_table(cache_conn) -> StephanosTable:
+    """
+    Load current Meineke texts with their normalizations.
+
+    Normalized fields are read from stephanos_normalized_texts (in the Herodian database, since
+    the Stephanos database is read-only) when the stored text hash still matches; anything new
+    or changed is normalized here and written back through `cache_conn`.
+    """
+    cached = load_normalized_texts(cache_conn)
+    stale: list[tuple[int, str, str, tuple[int, ...], tuple[str, ...]]] = []
+
+    lemma_ids: list[int] = []
+    headwords: list[str | None] = []
+    meineke_ids: list[str | None] = []
+    text_bodies: list[str] = []
+    norm_letters: list[str] = []
+    norm_letters_maps: list[tuple[int, ...]] = []
+    norm_words: list[tuple[str, ...]] = []
 
-def fetch_stephanos_entries() -> list[StephanosEntry]:
     conn = get_stephanos_connection()
     try:
-        with conn.cursor() as cur:
+        # Server-side cursor: normalize rows as they arrive instead of materializing them all first.
+        with conn.cursor(name="stephanos_meineke_stream") as cur:
+            cur.itersize = STREAM_ITERSIZE
             cur.execute(
                 """
-                SELECT l.id, l.lemma, l.meineke_id, v.text_body
+                SELECT l.id, l.lemma, l.meineke_id, v.text_body, md5(v.text_body)
                 FROM assembled_lemmas l
                 JOIN lemma_source_text_versions v
                   ON v.lemma_id = l.id
@@ -135,71 +400,214 @@ def fetch_stephanos_entries() -> list[StephanosEntry]:
                 ORDER BY l.id
                 """
             )
-            rows = cur.fetchall()
+            for lemma_id, headword, meineke_id, text_body, text_md5 in cur:
+                lemma_id = int(lemma_id)
+                hit = cached.get(lemma_id)
+                if hit is not None and hit[0] == text_md5:
+                    _, letters, letters_map, words = hit
+                else:
+                    letters, letters_map = normalize_greek_letters_with_map(text_body)
+                    words = normalize_greek_words(text_body)
+                    stale.append((lemma_id, text_md5, letters, letters_map, words))
+                lemma_ids.append(lemma_id)
+                headwords.append(headword)
+                meineke_ids.append(meineke_id)
+                text_bodies.append(text_body)
+                norm_letters.append(letters)
+                norm_letters_maps.append(letters_map)
+                norm_words.append(words)
     finally:
         conn.close()
 
-    entries: list[StephanosEntry] = []
-    for lemma_id, headword, meineke_id, text_body in rows:
-        norm_letters, norm_letters_map = normalize_greek_letters_with_map(text_body)
-        norm_words = normalize_greek_words(text_body)
-        entries.append(
-            StephanosEntry(
-                lemma_id=int(lemma_id),
-                headword=headword,
-                meineke_id=meineke_id,
-                text_body=text_body,
-                norm_letters=norm_letters,
-                norm_letters_map=norm_letters_map,
-                norm_words=norm_words,
-            )
-        )
-    return entries
+    with cache_conn:
+        store_normalized_texts(cache_conn, stale)
+    if stale:
+        print(f"Normalized {len(stale)} new or changed Stephanos texts.")
+
+    return StephanosTable(
+        lemma_ids=np.asarray(lemma_ids, dtype=np.int64),
+        headwords=headwords,
+        meineke_ids=meineke_ids,
+        text_bodies=text_bodies,
+        norm_letters=norm_letters,
+        norm_letters_maps=norm_letters_maps,
+        norm_words=norm_words,
+        letters_bytes=[encode_letters(letters) for letters in norm_letters],
+        letter_lens=np.fromiter(map(len, norm_letters), dtype=np.int64, count=len(norm_letters)),
+        word_lens=np.fromiter(map(len, norm_words), dtype=np.int64, count=len(norm_words)),
+    )
 
 
-def fetch_herodian_lines(limit: int | None) -> list[tuple[int, str, str]]:
-    conn = get_herodian_connection()
-    try:
-        with conn.cursor() as cur:
-            query = """
-                SELECT id, ref, greek_text
-                FROM cathpros_lines
-                WHERE greek_text IS NOT NULL
-                  AND ref NOT IN ('E')
-                ORDER BY ref_major NULLS LAST, ref_minor NULLS LAST, ref
-            """
-            if limit is not None:
-                query += " LIMIT %s"
-                cur.execute(query, (int(limit),))
-            else:
-                cur.execute(query)
-            rows = cur.fetchall()
-    finally:
-        conn.close()
-    return [(int(i), str(r), str(t)) for (i, r, t) in rows]
+def iter_herodian_lines(conn, limit: int | None) -> Iterator[tuple[int, str, str]]:
+    """
+    Stream (id, ref, greek_text) rows through a server-side cursor on `conn`.
+
+    The connection must stay open until iteration finishes.
+    """
+    with conn.cursor(name="herodian_lines_stream") as cur:
+        cur.itersize = STREAM_ITERSIZE
+        query = """
+            SELECT id, ref, greek_text
+            FROM cathpros_lines
+            WHERE greek_text IS NOT NULL
+              AND ref NOT IN ('E')
+            ORDER BY ref_major NULLS LAST, ref_minor NULLS LAST, ref
+        """
+        if limit is not None:
+            query += " LIMIT %s"
+            cur.execute(query, (int(limit),))
+        else:
+            cur.execute(query)
+        for line_id, ref, greek_text in cur:
+            yield int(line_id), str(ref), str(greek_text)
+
+
+@dataclass(frozen=True)
+class ShingleIndex:
+    """
+    Inverted index in CSR layout: the postings (dense entry indices) of `keys[r]` are
+    `values[offsets[r]:offsets[r + 1]]`. `keys` is sorted so lookups are a searchsorted.
+    """
+
+    keys: np.ndarray
+    offsets: np.ndarray
+    values: np.ndarray
+
+
+def build_shingle_index(entry_shingles: list[set[int]]) -> ShingleIndex:
+    sizes = np.fromiter((len(shs) for shs in entry_shingles), dtype=np.int64, count=len(entry_shingles))
+    total = int(sizes.sum())
+    all_keys = np.fromiter(
+        (sh for shs in entry_shingles for sh in shs), dtype=np.uint32, count=total
+    )
+    all_values = np.repeat(np.arange(len(entry_shingles), dtype=np.int32), sizes)
+
+    order = np.argsort(all_keys, kind="stable")
+    sorted_keys = all_keys[order]
+    keys, starts = np.unique(sorted_keys, return_index=True)
+    offsets = np.append(starts, total).astype(np.int64)
+    return ShingleIndex(keys=keys, offsets=offsets, values=all_values[order])
 
 
 def build_inverted_indexes(
-    entries: list[StephanosEntry], *, char_k: int, word_k: int
-) -> tuple[dict[int, list[int]], dict[int, list[int]]]:
-    char_index: dict[int, list[int]] = defaultdict(list)
-    word_index: dict[int, list[int]] = defaultdict(list)
+    table: StephanosTable, *, char_k: int, word_k: int
+) -> tuple[ShingleIndex, ShingleIndex]:
+    return (
+        build_shingle_index([char_shingles_bytes(data, char_k) for data in table.letters_bytes]),
+        build_shingle_index([word_shingles(words, word_k) for words in table.norm_words]),
+    )
+
 
-    for e in entries:
-        for sh in char_shingles(e.norm_letters, char_k):
-            char_index[sh].append(e.lemma_id)
-        for sh in word_shingles(e.norm_words, word_k):
-            word_index[sh].append(e.lemma_id)
+_SHINGLE_INDEX_FIELDS = ("keys", "offsets", "values")
 
-    return dict(char_index), dict(word_index)
+
+def shingle_index_cache_key(table: StephanosTable, *, char_k: int, word_k: int) -> str:
+    """
+    Content hash of everything the inverted indexes depend on (normalized texts, k values and
+    the shingle format).
+    """
+    digest = hashlib.sha1(f"{NORMALIZATION_VERSION}|{SHINGLE_INDEX_FORMAT}|{char_k}|{word_k}|{len(table)}".encode())
+    for letters, words in zip(table.norm_letters, table.norm_words):
+        digest.update(letters.encode("utf-8"))
+        digest.update(b"\x00")
+        digest.update(" ".join(words).encode("utf-8"))
+        digest.update(b"\x01")
+    return digest.hexdigest()
+
+
+def load_or_build_inverted_indexes(
+    table: StephanosTable, *, char_k: int, word_k: int, cache_dir: Path | None
+) -> tuple[ShingleIndex, ShingleIndex]:
+    """
+    Like build_inverted_indexes, but reuses indexes saved under `cache_dir` by an earlier run
+    over the same normalized texts. Cached arrays are memory-mapped rather than read in full.
+    Storing a new entry removes the older ones, so only the latest index stays on disk.
+    """
+    if cache_dir is None:
+        return build_inverted_indexes(table, char_k=char_k, word_k=word_k)
+
+    entry_dir = cache_dir / f"shingle-index-{shingle_index_cache_key(table, char_k=char_k, word_k=word_k)}"
+    if entry_dir.is_dir():
+        return tuple(
+            ShingleIndex(
+                **{
+                    field: np.load(entry_dir / f"{kind}_{field}.npy", mmap_mode="r")
+                    for field in _SHINGLE_INDEX_FIELDS
+                }
+            )
+            for kind in ("char", "word")
+        )
+
+    indexes = build_inverted_indexes(table, char_k=char_k, word_k=word_k)
+    # Write to a scratch directory and rename, so an interrupted run never leaves a partial entry.
+    tmp_dir = cache_dir / f".{entry_dir.name}.{os.getpid()}"
+    tmp_dir.mkdir(parents=True, exist_ok=True)
+    for kind, index in zip(("char", "word"), indexes):
+        for field in _SHINGLE_INDEX_FIELDS:
+            np.save(tmp_dir / f"{kind}_{field}.npy", getattr(index, field))
+    try:
+        tmp_dir.rename(entry_dir)
+    except OSError:
+        # Another run stored the same entry first; keep theirs.
+        for path in tmp_dir.iterdir():
+            path.unlink()
+        tmp_dir.rmdir()
+    # Scratch directories (dot-prefixed) of concurrent runs are left alone.
+    for stale_dir in cache_dir.glob("shingle-index-*"):
+        if stale_dir != entry_dir:
+            shutil.rmtree(stale_dir, ignore_errors=True)
+    return indexes
+
+
+def count_shingle_hits(shingles: set[int], index: ShingleIndex, *, minlength: int) -> np.ndarray:
+    """
+    Count, per dense entry index, how many of `shingles` appear in that entry's postings.
+    """
+    if not shingles or index.keys.size == 0:
+        return np.zeros(minlength, dtype=np.int64)
+    query = np.fromiter(shingles, dtype=np.uint32, count=len(shingles))
+    rows = np.searchsorted(index.keys, query)
+    found = rows < index.keys.size
+    found[found] = index.keys[rows[found]] == query[found]
+    rows = rows[found]
+    if rows.size == 0:
+        return np.zeros(minlength, dtype=np.int64)
+
+    # Gather the matched CSR slices in one fancy-indexing step instead of concatenating them.
+    starts = index.offsets[rows]
+    lengths = index.offsets[rows + 1] - starts
+    slice_begin = np.cumsum(lengths) - lengths
+    positions = np.arange(int(lengths.sum())) + np.repeat(starts - slice_begin, lengths)
+    return np.bincount(index.values[positions], minlength=minlength)
+
+
+def top_candidates(scores: np.ndarray, limit: int) -> list[int]:
+    """
+    Return the indices of the `limit` highest non-zero scores, best first.
+
+    Selection is O(n) via np.partition; ties (including at the cut-off) go to the lower index,
+    so the result is the same as a stable full sort.
+    """
+    if limit <= 0:
+        return []
+    hit_idx = np.flatnonzero(scores)
+    if hit_idx.size > limit:
+        hit_scores = scores[hit_idx]
+        cutoff = np.partition(hit_scores, hit_idx.size - limit)[hit_idx.size - limit]
+        keep = hit_scores > cutoff
+        tied = np.flatnonzero(hit_scores == cutoff)[: limit - int(np.count_nonzero(keep))]
+        keep[tied] = True
+        hit_idx = hit_idx[keep]
+    order = np.argsort(-scores[hit_idx], kind="stable")
+    return hit_idx[order].tolist()
 
 
 def compute_best_matches_for_line(
     *,
     line_text: str,
-    entries_by_id: dict[int, StephanosEntry],
-    char_index: dict[int, list[int]],
-    word_index: dict[int, list[int]],
+    table: StephanosTable,
+    char_index: ShingleIndex,
+    word_index: ShingleIndex,
     char_k: int,
     word_k: int,
     candidate_limit: int,
@@ -213,83 +621,175 @@ def compute_best_matches_for_line(
     line_char_sh = char_shingles(line_letters, char_k)
     line_word_sh = word_shingles(line_words, word_k)
 
-    char_hits: Counter[int] = Counter()
-    word_hits: Counter[int] = Counter()
-    for sh in line_char_sh:
-        for lemma_id in char_index.get(sh, ()):
-            char_hits[lemma_id] += 1
-    for sh in line_word_sh:
-        for lemma_id in word_index.get(sh, ()):
-            word_hits[lemma_id] += 1
-
-    combined: Counter[int] = Counter()
-    for lemma_id, n in char_hits.items():
-        combined[lemma_id] += n
-    for lemma_id, n in word_hits.items():
-        combined[lemma_id] += n * 5  # word shingles are higher-signal
-
-    candidates = [lemma_id for lemma_id, _ in combined.most_common(candidate_limit)]
+    char_hits = count_shingle_hits(line_char_sh, char_index, minlength=len(table))
+    word_hits = count_shingle_hits(line_word_sh, word_index, minlength=len(table))
+    combined = char_hits + word_hits * 5  # word shingles are higher-signal
+
+    candidates = top_candidates(combined, candidate_limit)
     if not candidates:
         return []
 
-    scored = []
-    for lemma_id in candidates:
-        entry = entries_by_id.get(lemma_id)
-        if not entry:
-            continue
+    # Build the line-side automata once; each candidate is then a single linear scan.
+    line_letters_sam = build_suffix_automaton(line_letters)
+    line_words_sam = build_suffix_automaton(line_words)
 
-        char_a, char_b, char_lcs = longest_common_block(line_letters, entry.norm_letters)
-        _word_a, _word_b, word_lcs = longest_common_block(line_words, entry.norm_words)
+    norm_letters = table.norm_letters
+    norm_words = table.norm_words
 
-        if char_lcs < min_char_lcs and word_lcs < min_word_lcs:
-            continue
+    cand = np.asarray(candidates, dtype=np.int64)
+    char_lcs = np.empty(cand.size, dtype=np.int64)
+    char_a = np.empty(cand.size, dtype=np.int64)
+    char_b = np.empty(cand.size, dtype=np.int64)
+    word_lcs = np.empty(cand.size, dtype=np.int64)
+    for pos, idx in enumerate(candidates):
+        char_a[pos], char_b[pos], char_lcs[pos] = longest_common_block_sam(line_letters_sam, norm_letters[idx])
+        word_lcs[pos] = longest_common_block_sam(line_words_sam, norm_words[idx])[2]
 
-        char_ratio = char_lcs / max(1, min(len(line_letters), len(entry.norm_letters)))
-        word_ratio = word_lcs / max(1, min(len(line_words), len(entry.norm_words)))
+    keep = np.flatnonzero((char_lcs >= min_char_lcs) | (word_lcs >= min_word_lcs))
+    if keep.size == 0:
+        return []
+    cand = cand[keep]
+    char_lcs = char_lcs[keep]
+    word_lcs = word_lcs[keep]
+    char_a = char_a[keep]
+    char_b = char_b[keep]
+    char_ratio = char_lcs / np.maximum(1, np.minimum(len(line_letters), table.letter_lens[cand]))
+    word_ratio = word_lcs / np.maximum(1, np.minimum(len(line_words), table.word_lens[cand]))
+    shared_char = char_hits[cand]
+    shared_word = word_hits[cand]
+
+    # Best first; equal keys keep candidate order (np.lexsort sorts by the last key first).
+    order = np.lexsort(
+        (
+            np.arange(cand.size),
+            -shared_char,
+            -shared_word,
+            -word_lcs,
+            -char_lcs,
+            -word_ratio,
+            -char_ratio,
+        )
+    )[:max_matches]
 
+    scored = []
+    for pos in order.tolist():
+        idx = int(cand[pos])
+        size = int(char_lcs[pos])
         herodian_char_start, herodian_char_end = map_norm_span_to_original(
             text=line_text,
             norm_map=line_letters_map,
-            norm_start=char_a,
-            norm_size=char_lcs,
+            norm_start=int(char_a[pos]),
+            norm_size=size,
         )
         stephanos_char_start, stephanos_char_end = map_norm_span_to_original(
-            text=entry.text_body,
-            norm_map=entry.norm_letters_map,
-            norm_start=char_b,
-            norm_size=char_lcs,
+            text=table.text_bodies[idx],
+            norm_map=table.norm_letters_maps[idx],
+            norm_start=int(char_b[pos]),
+            norm_size=size,
         )
-
         scored.append(
             {
-                "stephanos_lemma_id": lemma_id,
-                "stephanos_meineke_id": entry.meineke_id,
-                "stephanos_headword": entry.headword,
-                "char_lcs_len": int(char_lcs),
-                "char_lcs_ratio": float(char_ratio),
+                "stephanos_lemma_id": int(table.lemma_ids[idx]),
+                "stephanos_meineke_id": table.meineke_ids[idx],
+                "stephanos_headword": table.headwords[idx],
+                "char_lcs_len": size,
+                "char_lcs_ratio": float(char_ratio[pos]),
                 "herodian_char_start": herodian_char_start,
                 "herodian_char_end": herodian_char_end,
                 "stephanos_char_start": stephanos_char_start,
                 "stephanos_char_end": stephanos_char_end,
-                "word_lcs_len": int(word_lcs),
-                "word_lcs_ratio": float(word_ratio),
-                "shared_char_shingles": int(char_hits.get(lemma_id, 0)),
-                "shared_word_shingles": int(word_hits.get(lemma_id, 0)),
+                "word_lcs_len": int(word_lcs[pos]),
+                "word_lcs_ratio": float(word_ratio[pos]),
+                "shared_char_shingles": int(shared_char[pos]),
+                "shared_word_shingles": int(shared_word[pos]),
             }
         )
+    return scored
+
+
+# Read-only scoring inputs for worker processes, set once per process by _init_scoring_worker.
+_SCORING_CONTEXT: dict = {}
+
+# Lines handed to each worker per task.
+SCORING_CHUNKSIZE = 32
+
 
-    scored.sort(
-        key=lambda d: (
-            d["char_lcs_ratio"],
-            d["word_lcs_ratio"],
-            d["char_lcs_len"],
-            d["word_lcs_len"],
-            d["shared_word_shingles"],
-            d["shared_char_shingles"],
-        ),
-        reverse=True,
+def _init_scoring_worker(context: dict) -> None:
+    _SCORING_CONTEXT.clear()
+    _SCORING_CONTEXT.update(context)
+
+
+def _score_line(line: tuple[int, str, str]) -> tuple[int, list[dict]]:
+    line_id, _ref, greek_text = line
+    return line_id, compute_best_matches_for_line(line_text=greek_text, **_SCORING_CONTEXT)
+
+
+def score_lines(
+    lines: Iterator[tuple[int, str, str]], *, context: dict, workers: int
+) -> Iterator[tuple[int, list[dict]]]:
+    """
+    Yield (line_id, matches) for each line, in completion order.
+
+    With workers > 1 lines are scored in a process pool; `context` (the Stephanos table and
+    indexes plus scoring parameters) is installed once per worker rather than sent per task.
+    """
+    if workers <= 1:
+        _init_scoring_worker(context)
+        for line in lines:
+            yield _score_line(line)
+        return
+    with multiprocessing.Pool(
+        processes=workers, initializer=_init_scoring_worker, initargs=(context,)
+    ) as pool:
+        yield from pool.imap_unordered(_score_line, lines, chunksize=SCORING_CHUNKSIZE)
+
+
+MATCH_COLUMNS = (
+    "run_id",
+    "herodian_line_id",
+    "stephanos_lemma_id",
+    "stephanos_meineke_id",
+    "stephanos_headword",
+    "char_lcs_len",
+    "char_lcs_ratio",
+    "herodian_char_start",
+    "herodian_char_end",
+    "stephanos_char_start",
+    "stephanos_char_end",
+    "word_lcs_len",
+    "word_lcs_ratio",
+    "shared_char_shingles",
+    "shared_word_shingles",
+)
+
+COPY_BATCH_ROWS = 50000
+
+
+def _copy_text_value(value) -> str:
+    """
+    Encode one value for COPY ... FROM STDIN (text format): \\N for NULL, backslash escapes.
+    """
+    if value is None:
+        return "\\N"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def copy_match_rows(cur, rows: list[tuple]) -> None:
+    buf = io.StringIO()
+    for row in rows:
+        buf.write("\t".join(_copy_text_value(v) for v in row))
+        buf.write("\n")
+    buf.seek(0)
+    cur.copy_expert(
+        f"COPY stephanos_overlap_matches ({', '.join(MATCH_COLUMNS)}) FROM STDIN",
+        buf,
     )
-    return scored[:max_matches]
 
 
 def main() -> None:
@@ -302,20 +802,45 @@ def main() -> None:
     parser.add_argument("--word-shingle", type=int, default=5, help="Word shingle length (default: 5)")
     parser.add_argument("--min-char-lcs", type=int, default=30, help="Min char LCS to keep a match (default: 30)")
     parser.add_argument("--min-word-lcs", type=int, default=4, help="Min word LCS to keep a match (default: 4)")
-    args = parser.parse_args()
-
-    stephanos_entries = fetch_stephanos_entries()
-    entries_by_id = {e.lemma_id: e for e in stephanos_entries}
-
-    char_index, word_index = build_inverted_indexes(
-        stephanos_entries, char_k=args.char_shingle, word_k=args.word_shingle
+    parser.add_argument(
+        "--index-cache",
+        default=".overlap_cache",
+        help="Directory for cached shingle indexes (default: .overlap_cache; empty string disables)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Scoring processes (default: CPU count; 1 = score in-process)",
+    )
+    args = parser.parse_args()
 
-    herodian_lines = fetch_herodian_lines(args.limit_lines)
-
-    now = datetime.now(timezone.utc)
     her_conn = get_herodian_connection()
+    # Separate read connection: the pool's feeder thread pulls lines while this thread runs COPY.
+    lines_conn = get_herodian_connection()
     try:
+        stephanos_table = fetch_stephanos_table(her_conn)
+
+        char_index, word_index = load_or_build_inverted_indexes(
+            stephanos_table,
+            char_k=args.char_shingle,
+            word_k=args.word_shingle,
+            cache_dir=Path(args.index_cache) if args.index_cache else None,
+        )
+
+        scoring_context = {
+            "table": stephanos_table,
+            "char_index": char_index,
+            "word_index": word_index,
+            "char_k": args.char_shingle,
+            "word_k": args.word_shingle,
+            "candidate_limit": args.candidate_limit,
+            "max_matches": args.max_matches,
+            "min_char_lcs": args.min_char_lcs,
+            "min_word_lcs": args.min_word_lcs,
+        }
+
+        now = datetime.now(timezone.utc)
         with her_conn:
             with her_conn.cursor() as cur:
                 cur.execute(
@@ -328,29 +853,24 @@ def main() -> None:
                     (
                         args.metric_version,
                         now,
-                        len(stephanos_entries),
-                        len(stephanos_entries),
+                        len(stephanos_table),
+                        len(stephanos_table),
                     ),
                 )
                 (run_id,) = cur.fetchone()
 
-                rows_to_insert = []
-                for idx, (line_id, ref, greek_text) in enumerate(herodian_lines, 1):
-                    matches = compute_best_matches_for_line(
-                        line_text=greek_text,
-                        entries_by_id=entries_by_id,
-                        char_index=char_index,
-                        word_index=word_index,
-                        char_k=args.char_shingle,
-                        word_k=args.word_shingle,
-                        candidate_limit=args.candidate_limit,
-                        max_matches=args.max_matches,
-                        min_char_lcs=args.min_char_lcs,
-                        min_word_lcs=args.min_word_lcs,
-                    )
-
+                # Matches are streamed to COPY in batches rather than held for one big insert.
+                pending_rows: list[tuple] = []
+                matches_written = 0
+                lines_scored = 0
+                scored_lines = score_lines(
+                    iter_herodian_lines(lines_conn, args.limit_lines),
+                    context=scoring_context,
+                    workers=args.workers,
+                )
+                for idx, (line_id, matches) in enumerate(scored_lines, 1):
                     for m in matches:
-                        rows_to_insert.append(
+                        pending_rows.append(
                             (
                                 int(run_id),
                                 int(line_id),
@@ -370,24 +890,20 @@ def main() -> None:
                             )
                         )
 
-                    if idx % 25 == 0 or idx == len(herodian_lines):
-                        print(f"Scored {idx}/{len(herodian_lines)} Herodian lines…")
-
-                if rows_to_insert:
-                    execute_values(
-                        cur,
-                        """
-                        INSERT INTO stephanos_overlap_matches
-                          (run_id, herodian_line_id, stephanos_lemma_id, stephanos_meineke_id, stephanos_headword,
-                           char_lcs_len, char_lcs_ratio,
-                           herodian_char_start, herodian_char_end, stephanos_char_start, stephanos_char_end,
-                           word_lcs_len, word_lcs_ratio,
-                           shared_char_shingles, shared_word_shingles)
-                        VALUES %s
-                        """,
-                        rows_to_insert,
-                        page_size=5000,
-                    )
+                    if len(pending_rows) >= COPY_BATCH_ROWS:
+                        copy_match_rows(cur, pending_rows)
+                        matches_written += len(pending_rows)
+                        pending_rows.clear()
+
+                    lines_scored = idx
+                    if idx % 25 == 0:
+                        print(f"Scored {idx} Herodian lines…")
+
+                print(f"Scored {lines_scored} Herodian lines.")
+
+                if pending_rows:
+                    copy_match_rows(cur, pending_rows)
+                    matches_written += len(pending_rows)
 
                 cur.execute(
                     "UPDATE stephanos_overlap_runs SET finished_at = %s WHERE id = %s",
@@ -395,9 +911,10 @@ def main() -> None:
                 )
 
     finally:
+        lines_conn.close()
         her_conn.close()
 
-    print(f"OK: overlap run complete (run_id={run_id}, matches={len(rows_to_insert)}).")
+    print(f"OK: overlap run complete (run_id={run_id}, matches={matches_written}).")
 
 
 if __name__ == "__main__":
@@ -2,12 +2,12 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import json
 import re
-import time
 from datetime import datetime, timezone
 
-from openai import OpenAI
+from openai import AsyncOpenAI
 
 from db import get_connection
 from openai_utils import load_openai_api_key
@@ -71,35 +71,43 @@ def _load_model(default: str) -> str:
     return (CONFIG_GADGET_MODEL or default).strip()
 
 
-_FORBIDDEN_HTML_RE = re.compile(
-    r"<\s*(script|style|link|iframe|object|embed)\b", re.IGNORECASE
-)
-_FORBIDDEN_JS_RE = re.compile(
-    r"\b(fetch|XMLHttpRequest|WebSocket)\b|\bimport\s*\(",
+# One alternation, scanned once over html+css+js; each named group only counts in its own field.
+_FORBIDDEN_RE = re.compile(
+    r"(?P<url>https?://)"
+    r"|(?P<html><\s*(?:script|style|link|iframe|object|embed)\b)"
+    r"|(?P<js>\b(?:fetch|XMLHttpRequest|WebSocket)\b|\bimport\s*\()",
     re.IGNORECASE,
 )
-_URL_RE = re.compile(r"https?://", re.IGNORECASE)
 
 
 def _validate_gadget(*, html: str, css: str, js: str) -> None:
     combined = f"{html}\n{css}\n{js}"
-    if _URL_RE.search(combined):
-        raise ValueError("Gadget output contains a URL; must be offline/self-contained.")
-    if _FORBIDDEN_HTML_RE.search(html):
+    html_end = len(html)
+    js_start = len(combined) - len(js)
+    found: set[str] = set()
+    for m in _FORBIDDEN_RE.finditer(combined):
+        kind = m.lastgroup
+        if kind == "url":
+            raise ValueError("Gadget output contains a URL; must be offline/self-contained.")
+        if kind == "html" and m.end() <= html_end:
+            found.add(kind)
+        elif kind == "js" and m.start() >= js_start:
+            found.add(kind)
+    if "html" in found:
         raise ValueError("Gadget HTML contains forbidden tags (<script>/<style>/<link>/etc.).")
-    if _FORBIDDEN_JS_RE.search(js):
+    if "js" in found:
         raise ValueError("Gadget JS appears to use network or dynamic import APIs.")
 
 
-def generate_one(
-    client: OpenAI,
+async def generate_one(
+    client: AsyncOpenAI,
     *,
     model: str,
     ref: str,
     greek_text: str,
     english_translation: str,
 ) -> tuple[str, str, str, int]:
-    response = client.chat.completions.create(
+    response = await client.chat.completions.create(
         model=model,
         messages=[
             {"role": "system", "content": SYSTEM_PROMPT},
@@ -129,6 +137,85 @@ def generate_one(
     return html, css, js, tokens_used
 
 
+async def generate_pending(
+    cur,
+    *,
+    api_key: str,
+    model: str,
+    rows: list[tuple],
+    concurrency: int,
+    delay: float,
+) -> tuple[int, int]:
+    """
+    Generate gadgets for `rows` with up to `concurrency` requests in flight.
+
+    Results are written through `cur` as each request completes; all writes happen on the
+    event loop thread, so they stay serialized. The client is opened and closed on this
+    coroutine's loop, so its connection pool is released before asyncio.run returns.
+    Returns (generated, total_tokens).
+    """
+    async with AsyncOpenAI(api_key=api_key) as client:
+        sem = asyncio.Semaphore(max(1, concurrency))
+
+        async def one(row: tuple):
+            async with sem:
+                now = datetime.now(timezone.utc)
+                try:
+                    result = await generate_one(
+                        client,
+                        model=model,
+                        ref=row[1],
+                        greek_text=row[2],
+                        english_translation=row[3],
+                    )
+                except Exception as e:  # noqa: BLE001 - keep pipeline running
+                    result = e
+                if delay and delay > 0:
+                    await asyncio.sleep(delay)
+            return row, now, result
+
+        total_tokens = 0
+        generated = 0
+        for next_done in asyncio.as_completed([one(row) for row in rows]):
+            (line_id, ref, _greek_text, _english_translation), now, result = await next_done
+            if isinstance(result, Exception):
+                cur.execute(
+                    """
+                    UPDATE cathpros_lines
+                    SET gadget_error = %s,
+                        gadget_last_attempted_at = %s,
+                        gadget_attempts = gadget_attempts + 1
+                    WHERE id = %s
+                    """,
+                    (repr(result), now, line_id),
+                )
+                print(f"FAILED gadget {ref} (id={line_id}): {result}")
+                continue
+
+            html, css, js, tokens_used = result
+            total_tokens += tokens_used
+            cur.execute(
+                """
+                UPDATE cathpros_lines
+                SET gadget_html = %s,
+                    gadget_css = %s,
+                    gadget_js = %s,
+                    gadget_generated_at = %s,
+                    gadget_model = %s,
+                    gadget_tokens = %s,
+                    gadget_error = NULL,
+                    gadget_last_attempted_at = %s,
+                    gadget_attempts = gadget_attempts + 1
+                WHERE id = %s
+                """,
+                (html, css, js, now, model, tokens_used, now, line_id),
+            )
+            generated += 1
+            print(f"Generated gadget for {ref} (id={line_id}, tokens={tokens_used}).")
+
+        return generated, total_tokens
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         description="Generate one (or a few) small HTML/CSS/JS gadgets for Herodian passages."
@@ -136,6 +223,9 @@ def main() -> None:
     parser.add_argument("--limit", type=int, default=1, help="Max gadgets to generate (default: 1)")
     parser.add_argument("--model", default="gpt-5.2", help="OpenAI model name (default: gpt-5.2)")
     parser.add_argument("--delay", type=float, default=0.0, help="Delay between requests in seconds")
+    parser.add_argument(
+        "--concurrency", type=int, default=4, help="Max requests in flight at once (default: 4)"
+    )
     args = parser.parse_args()
 
     if args.limit <= 0:
@@ -144,7 +234,6 @@ def main() -> None:
 
     model = _load_model(args.model)
     api_key = load_openai_api_key()
-    client = OpenAI(api_key=api_key)
 
     conn = get_connection()
     total_tokens = 0
@@ -173,50 +262,16 @@ def main() -> None:
                     print("No lines pending gadget.")
                     return
 
-                for line_id, ref, greek_text, english_translation in rows:
-                    now = datetime.now(timezone.utc)
-                    try:
-                        html, css, js, tokens_used = generate_one(
-                            client,
-                            model=model,
-                            ref=ref,
-                            greek_text=greek_text,
-                            english_translation=english_translation,
-                        )
-                        total_tokens += tokens_used
-                        cur.execute(
-                            """
-                            UPDATE cathpros_lines
-                            SET gadget_html = %s,
-                                gadget_css = %s,
-                                gadget_js = %s,
-                                gadget_generated_at = %s,
-                                gadget_model = %s,
-                                gadget_tokens = %s,
-                                gadget_error = NULL,
-                                gadget_last_attempted_at = %s,
-                                gadget_attempts = gadget_attempts + 1
-                            WHERE id = %s
-                            """,
-                            (html, css, js, now, model, tokens_used, now, line_id),
-                        )
-                        generated += 1
-                        print(f"Generated gadget for {ref} (id={line_id}, tokens={tokens_used}).")
-                    except Exception as e:  # noqa: BLE001 - keep pipeline running
-                        cur.execute(
-                            """
-                            UPDATE cathpros_lines
-                            SET gadget_error = %s,
-                                gadget_last_attempted_at = %s,
-                                gadget_attempts = gadget_attempts + 1
-                            WHERE id = %s
-                            """,
-                            (repr(e), now, line_id),
-                        )
-                        print(f"FAILED gadget {ref} (id={line_id}): {e}")
-
-                    if args.delay and args.delay > 0:
-                        time.sleep(args.delay)
+                generated, total_tokens = asyncio.run(
+                    generate_pending(
+                        cur,
+                        api_key=api_key,
+                        model=model,
+                        rows=rows,
+                        concurrency=args.concurrency,
+                        delay=args.delay,
+                    )
+                )
     finally:
         conn.close()
 
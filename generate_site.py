@@ -2,42 +2,58 @@
 from __future__ import annotations
 
 import argparse
+import base64
+import gzip
+import hashlib
+import heapq
 import json
 import math
+import multiprocessing
 import os
 import re
+import shutil
 import unicodedata
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from itertools import groupby
 from html import escape
+from operator import itemgetter
 from pathlib import Path
 
+import numpy as np
+from psycopg2.extensions import cursor as TupleCursor
+
 from db import get_connection
 from stephanos_db import get_connection as get_stephanos_connection
 
+# Optional local settings, imported once; the accessors below fall back to their defaults.
+try:
+    import config as _CONFIG
+except ImportError:
+    _CONFIG = None
+
+
+def _config_value(attr: str):
+    return getattr(_CONFIG, attr, None)
+
 
+# Config-derived values are fixed for the life of the process, so the accessors are memoized
+# (defaults are hashable for that reason).
+@lru_cache(maxsize=None)
 def _site_title(default: str) -> str:
-    try:
-        from config import SITE_TITLE as CONFIG_SITE_TITLE
-    except ImportError:
-        CONFIG_SITE_TITLE = None
-    return (CONFIG_SITE_TITLE or default).strip()
+    return (_config_value("SITE_TITLE") or default).strip()
 
 
+@lru_cache(maxsize=None)
 def _site_contact_name(default: str) -> str:
-    try:
-        from config import SITE_CONTACT_NAME as CONFIG_SITE_CONTACT_NAME
-    except ImportError:
-        CONFIG_SITE_CONTACT_NAME = None
-    return (CONFIG_SITE_CONTACT_NAME or default).strip()
+    return (_config_value("SITE_CONTACT_NAME") or default).strip()
 
 
-def _site_contact_emails(default: list[str]) -> list[str]:
-    try:
-        from config import SITE_CONTACT_EMAILS as CONFIG_SITE_CONTACT_EMAILS
-    except ImportError:
-        CONFIG_SITE_CONTACT_EMAILS = None
-
-    val = CONFIG_SITE_CONTACT_EMAILS
+@lru_cache(maxsize=None)
+def _site_contact_emails(default: tuple[str, ...]) -> tuple[str, ...]:
+    val = _config_value("SITE_CONTACT_EMAILS")
     if val in (None, ""):
         return default
     if isinstance(val, str):
@@ -48,16 +64,11 @@ def _site_contact_emails(default: list[str]) -> list[str]:
     else:
         return default
 
-    emails = [e for e in emails if "@" in e]
-    return emails or default
+    return tuple(e for e in emails if "@" in e) or default
 
 
 def _config_int(attr: str, default: int) -> int:
-    try:
-        import config as _config
-    except ImportError:
-        _config = None
-    raw = getattr(_config, attr, None) if _config else None
+    raw = _config_value(attr)
     if raw in (None, ""):
         return int(default)
     try:
@@ -67,11 +78,7 @@ def _config_int(attr: str, default: int) -> int:
 
 
 def _config_str(attr: str, default: str) -> str:
-    try:
-        import config as _config
-    except ImportError:
-        _config = None
-    raw = getattr(_config, attr, None) if _config else None
+    raw = _config_value(attr)
     if raw in (None, ""):
         return str(default)
     return str(raw)
@@ -133,218 +140,121 @@ def _estimate_backlog(
     }
 
 
-STYLE_CSS = """
-:root{
-  --bg:#0b1020;
-  --panel:#111a33;
-  --text:#e7ecff;
-  --muted:#aab4e6;
-  --accent:#7aa2ff;
-  --border:#243059;
-}
-html,body{height:100%;}
-body{
-  margin:0;
-  background:linear-gradient(180deg,var(--bg),#070a14);
-  color:var(--text);
-  font-family: ui-sans-serif, system-ui, -apple-system, Segoe UI, Roboto, Helvetica, Arial, "Apple Color Emoji","Segoe UI Emoji";
-}
-a{color:var(--accent); text-decoration:none;}
-a:hover{text-decoration:underline;}
-.wrap{max-width:1100px;margin:0 auto;padding:28px 18px 64px;}
-header{display:flex;gap:16px;align-items:baseline;flex-wrap:wrap;}
-h1{font-size:28px;margin:0;}
-.meta{color:var(--muted);font-size:14px;}
-.banner{
-  margin:0 0 16px;
-  padding:12px 14px;
-  border-radius:14px;
-  border:1px solid var(--border);
-  background:rgba(17,26,51,.55);
-}
-.banner.warn{
-  border-color:#5a3b24;
-  background:rgba(90,59,36,.20);
-}
-.banner .badge{
-  display:inline-block;
-  padding:2px 10px;
-  border-radius:999px;
-  border:1px solid #5a3b24;
-  background:rgba(90,59,36,.35);
-  color:#ffd9c2;
-  font-size:12px;
-  letter-spacing:.04em;
-  text-transform:uppercase;
-  margin-right:8px;
-  vertical-align:1px;
-}
-.banner .muted{color:var(--muted);}
-.controls{margin-top:14px;display:flex;gap:10px;flex-wrap:wrap;}
-input[type="search"]{
-  flex:1 1 320px;
-  padding:10px 12px;
-  border-radius:10px;
-  border:1px solid var(--border);
-  background:rgba(17,26,51,.65);
-  color:var(--text);
-  outline:none;
-}
-.btn{
-  display:inline-flex;
-  align-items:center;
-  gap:8px;
-  padding:9px 12px;
-  border-radius:10px;
-  border:1px solid var(--border);
-  background:rgba(17,26,51,.55);
-  color:var(--text);
-}
-.btn.tiny{padding:6px 10px;font-size:12px;}
-button.btn{cursor:pointer;font:inherit;}
-.pill{
-  display:inline-block;
-  padding:3px 10px;
-  border-radius:999px;
-  border:1px solid var(--border);
-  color:var(--muted);
-  font-size:12px;
-}
-.tag{
-  display:inline-block;
-  padding:2px 10px;
-  border-radius:999px;
-  border:1px solid var(--border);
-  color:var(--muted);
-  font-size:12px;
-  margin-right:6px;
-}
-.tag.ok{border-color:#2c5b3c;background:rgba(44,91,60,.25);color:#c7ffd2;}
-.tag.todo{border-color:#5a3b24;background:rgba(90,59,36,.25);color:#ffd9c2;}
-
-.table-wrap{
-  margin-top:18px;
-  border:1px solid var(--border);
-  border-radius:14px;
-  overflow:hidden;
-  background:rgba(17,26,51,.55);
-}
-table.tbl{width:100%;border-collapse:separate;border-spacing:0;}
-table.tbl thead th{
-  position:sticky; top:0; z-index:1;
-  text-align:left;
-  font-size:12px;
-  letter-spacing:.02em;
-  color:var(--muted);
-  padding:10px 12px;
-  border-bottom:1px solid var(--border);
-  background:rgba(17,26,51,.92);
-}
-table.tbl thead th.sortable{cursor:pointer; user-select:none;}
-table.tbl thead th.sortable:hover{background:rgba(17,26,51,.98);}
-table.tbl thead th .arrow{margin-left:6px; opacity:.7; font-size:11px;}
-table.tbl tbody td{
-  padding:10px 12px;
-  border-bottom:1px solid rgba(36,48,89,.65);
-  vertical-align:top;
-}
-table.tbl tbody tr:hover{background:rgba(17,26,51,.75);}
-table.tbl td.ref a{font-weight:650;}
-table.tbl td.small{white-space:nowrap;}
-.list{margin-top:18px;display:flex;flex-direction:column;gap:10px;}
-.row{
-  border:1px solid var(--border);
-  background:rgba(17,26,51,.55);
-  border-radius:14px;
-  padding:12px 14px 11px;
-}
-.row-head{display:flex;gap:10px;align-items:center;justify-content:space-between;flex-wrap:wrap;}
-.ref{font-weight:650; font-size:16px;}
-.summary{color:var(--muted); font-size:14px; margin-top:6px;}
-.kvs{display:flex;gap:8px;flex-wrap:wrap; align-items:center;}
-.kv{color:var(--muted); font-size:12px; border:1px solid var(--border); border-radius:999px; padding:2px 10px;}
-.ts{color:var(--muted);font-size:12px;}
-.grid{display:grid;grid-template-columns:1fr;gap:10px;margin-top:14px;}
-@media (min-width: 880px){
-  .grid{grid-template-columns:1fr 1fr;}
-}
-.greek{
-  font-family: ui-serif, "New Athena Unicode", "Palatino Linotype", Palatino, serif;
-  font-size:16px;
-  line-height:1.55;
-  white-space:pre-wrap;
-}
-.english{
-  font-size:15px;
-  line-height:1.55;
-  white-space:pre-wrap;
-}
-.prose{
-  font-size:15px;
-  line-height:1.55;
-}
-.prose p{margin:0 0 10px;}
-.prose ul{margin:0 0 10px 20px;}
-.prose li{margin:0 0 6px;}
-.pending{color:var(--muted);font-style:italic;}
-.hl{padding:0 2px;border-radius:4px;}
-.hl-h{background:rgba(255,214,10,.22);}
-.hl-s{background:rgba(122,162,255,.22);}
-.swatch{
-  display:inline-block;
-  width:12px;
-  height:12px;
-  border-radius:4px;
-  margin-right:8px;
-  vertical-align:-2px;
-  border:1px solid rgba(231,236,255,.18);
-}
-.c0{background:rgba(255,214,10,.22);}
-.c1{background:rgba(122,162,255,.22);}
-.c2{background:rgba(100,231,173,.20);}
-.c3{background:rgba(255,143,171,.20);}
-.c4{background:rgba(255,170,0,.20);}
-.c5{background:rgba(0,210,255,.18);}
-.c6{background:rgba(186,104,200,.20);}
-.c7{background:rgba(239,83,80,.18);}
-.c8{background:rgba(149,117,205,.20);}
-.c9{background:rgba(76,175,80,.18);}
-.gadget-frame{
-  width:100%;
-  height:390px;
-  border:1px solid var(--border);
-  border-radius:14px;
-  background:rgba(17,26,51,.35);
-}
-details{margin-top:10px;}
-details summary{cursor:pointer; color:var(--accent);}
-pre{
-  background:rgba(17,26,51,.45);
-  border:1px solid var(--border);
-  border-radius:12px;
-  padding:12px;
-  overflow:auto;
-  white-space:pre-wrap;
-}
-footer{margin-top:26px;color:var(--muted);font-size:13px;}
-"""
+# Site stylesheet, kept as a static asset and written (minified) to <out>/style.css per build.
+STYLE_CSS_PATH = Path(__file__).resolve().parent / "assets" / "style.css"
+
+# Rows fetched per round-trip when streaming passages from the database.
+LINES_ITERSIZE = 2000
+# Rows fetched per round-trip when streaming the latest run's overlap matches.
+OVERLAPS_ITERSIZE = 10000
+# Rows fetched per round-trip when streaming Stephanos lemma lengths for the coverage page.
+STEPHANOS_LENGTHS_ITERSIZE = 10000
+# Rows fetched per round-trip when streaming Stephanos texts for the passage pages (whole
+# lemma bodies, so fewer per batch).
+STEPHANOS_TEXTS_ITERSIZE = 500
+
+# Columns of the passage scan, in SELECT order; each row becomes a plain dict with these keys.
+# The keys are these interned constants (shared by every row, hashes cached), and the dicts
+# go straight to json.dumps, so rows are not wrapped in a slotted class.
+LINE_COLUMNS = (
+    "id",
+    "ref",
+    "ref_major",
+    "ref_minor",
+    "greek_text",
+    "english_translation",
+    "summary",
+    "gadget_html",
+    "gadget_css",
+    "gadget_js",
+    "translated_at",
+)
+
+
+# Columns of the overlap scan after herodian_line_id, in SELECT order; each match becomes a
+# plain dict with these keys, grouped by line.
+OVERLAP_COLUMNS = (
+    "stephanos_lemma_id",
+    "stephanos_meineke_id",
+    "stephanos_headword",
+    "char_lcs_len",
+    "char_lcs_ratio",
+    "herodian_char_start",
+    "herodian_char_end",
+    "stephanos_char_start",
+    "stephanos_char_end",
+    "word_lcs_len",
+    "word_lcs_ratio",
+)
+
+
+def _minify_css(css: str) -> str:
+    # Collapse whitespace runs, then drop the spaces around braces and semicolons.
+    return re.sub(r"\s*([{};])\s*", r"\1", re.sub(r"\s+", " ", css)).strip()
+
+
+@lru_cache(maxsize=1)
+def _style_css_min() -> str:
+    return _minify_css(STYLE_CSS_PATH.read_text(encoding="utf-8"))
+
 
 _SAFE_REF_RE = re.compile(r"[^0-9A-Za-z._-]+")
+_is_safe_slug = re.compile(r"[0-9A-Za-z._-]*").fullmatch
+# "/" and " " each become their own "_" (runs of other unsafe characters collapse to one).
+_SLUG_SEPARATORS = str.maketrans({"/": "_", " ": "_"})
+
+# True for strings that html.escape would return unchanged (the common shape of a ref).
+_is_html_safe = re.compile(r"[0-9A-Za-z._:-]*").fullmatch
+
+
+def _write_bytes(path: Path, payload: bytes) -> None:
+    data = memoryview(payload)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        while data:
+            data = data[os.write(fd, data) :]
+    finally:
+        os.close(fd)
+
+
+def _has_content(path: Path, payload: bytes) -> bool:
+    try:
+        if path.stat().st_size != len(payload):
+            return False
+        return path.read_bytes() == payload
+    except OSError:
+        return False
+
+
+def write_site_file(path: Path, text: str, *, precompress: bool = False, skip_unchanged: bool = False) -> None:
+    """
+    Write `text` as UTF-8 with one encode and raw os.write calls (no TextIOWrapper).
+
+    With precompress=True a `<name>.gz` sibling is written too, so the web server can
+    serve it directly (e.g. nginx gzip_static) instead of compressing per request.
+
+    With skip_unchanged=True nothing is written (or compressed) when the file already holds
+    exactly this text; meant for files without the per-build footer timestamp.
+    """
+    payload = text.encode("utf-8")
+    gz_path = path.with_name(path.name + ".gz")
+    if skip_unchanged and _has_content(path, payload) and (not precompress or gz_path.exists()):
+        return
+    _write_bytes(path, payload)
+    if precompress:
+        _write_bytes(gz_path, gzip.compress(payload, compresslevel=9, mtime=0))
 
 
 def ref_to_slug(ref: str) -> str:
-    slug = ref.strip()
-    slug = slug.replace("/", "_").replace(" ", "_")
-    slug = _SAFE_REF_RE.sub("_", slug)
+    slug = ref.strip().translate(_SLUG_SEPARATORS)
+    if not _is_safe_slug(slug):
+        slug = _SAFE_REF_RE.sub("_", slug)
     return slug or "ref"
 
 
+@lru_cache(maxsize=None)
 def _stephanos_base_url(default: str) -> str:
-    try:
-        from config import STEPHANOS_SITE_BASE_URL as CONFIG_STEPHANOS_SITE_BASE_URL
-    except ImportError:
-        CONFIG_STEPHANOS_SITE_BASE_URL = None
-    return (CONFIG_STEPHANOS_SITE_BASE_URL or default).rstrip("/")
+    return (_config_value("STEPHANOS_SITE_BASE_URL") or default).rstrip("/")
 
 
 def stephanos_entry_url(*, base_url: str, lemma_id: int) -> str:
@@ -360,12 +270,23 @@ def stephanos_entry_url(*, base_url: str, lemma_id: int) -> str:
 def _to_int(value) -> int | None:
     if value is None:
         return None
+    if type(value) is int:
+        return value
     try:
         return int(value)
-    except Exception:
+    except (TypeError, ValueError, OverflowError):
         return None
 
 
+# Characters html.escape rewrites. Greek passages almost never contain them, so the highlight
+# helpers check a text once and then slice it as-is instead of escaping every segment.
+_HTML_SPECIAL_RE = re.compile(r"[&<>\"']")
+
+
+def _segment_escaper(text: str) -> Callable[[str], str]:
+    return escape if _HTML_SPECIAL_RE.search(text) else str
+
+
 def highlight_html(text: str, *, start, end, cls: str) -> str:
     start_i = _to_int(start)
     end_i = _to_int(end)
@@ -373,12 +294,13 @@ def highlight_html(text: str, *, start, end, cls: str) -> str:
         return escape(text or "")
     if start_i < 0 or end_i <= start_i or end_i > len(text):
         return escape(text or "")
+    esc = _segment_escaper(text)
     return (
-        escape(text[:start_i])
+        esc(text[:start_i])
         + f'<span class="hl {cls}">'
-        + escape(text[start_i:end_i])
+        + esc(text[start_i:end_i])
         + "</span>"
-        + escape(text[end_i:])
+        + esc(text[end_i:])
     )
 
 
@@ -395,14 +317,15 @@ def highlight_snippet_html(
     right = min(len(text), end_i + int(context))
     prefix = "…" if left > 0 else ""
     suffix = "…" if right < len(text) else ""
+    esc = _segment_escaper(text[left:right])
     return (
-        escape(prefix)
-        + escape(text[left:start_i])
+        prefix
+        + esc(text[left:start_i])
         + f'<span class="hl {cls}">'
-        + escape(text[start_i:end_i])
+        + esc(text[start_i:end_i])
         + "</span>"
-        + escape(text[end_i:right])
-        + escape(suffix)
+        + esc(text[end_i:right])
+        + suffix
     )
 
 
@@ -437,32 +360,32 @@ def highlight_many_html(text: str, spans: list[dict]) -> str:
         breakpoints.add(end_i)
 
     points = sorted(breakpoints)
-    intervals: list[tuple[int, int, str | None]] = []
+    # Sweep the breakpoints with a heap of the spans started so far, ordered like the winner
+    # rule (highest priority, then longest, then first given); spans that have already ended
+    # are dropped lazily when they reach the top.
+    by_start = sorted(range(len(cleaned)), key=lambda idx: cleaned[idx][0])
+    active: list[tuple[float, int, int]] = []
+    next_start = 0
+    merged: list[tuple[int, int, str | None]] = []
     for i in range(len(points) - 1):
         a, b = points[i], points[i + 1]
-        if a >= b:
-            continue
-        covering = [
-            (s, e, cls, prio)
-            for (s, e, cls, prio) in cleaned
-            if s <= a and e >= b
-        ]
-        if not covering:
-            intervals.append((a, b, None))
-            continue
-        best = max(covering, key=lambda t: (t[3], t[1] - t[0]))
-        intervals.append((a, b, best[2]))
-
-    merged: list[tuple[int, int, str | None]] = []
-    for a, b, cls in intervals:
+        while next_start < len(by_start) and cleaned[by_start[next_start]][0] <= a:
+            idx = by_start[next_start]
+            s, e, _cls, prio = cleaned[idx]
+            heapq.heappush(active, (-prio, s - e, idx))
+            next_start += 1
+        while active and cleaned[active[0][2]][1] <= a:
+            heapq.heappop(active)
+        cls = cleaned[active[0][2]][2] if active else None
         if merged and merged[-1][2] == cls and merged[-1][1] == a:
             merged[-1] = (merged[-1][0], b, cls)
         else:
             merged.append((a, b, cls))
 
+    esc = _segment_escaper(text)
     parts: list[str] = []
     for a, b, cls in merged:
-        seg = escape(text[a:b])
+        seg = esc(text[a:b])
         if cls:
             parts.append(f'<span class="hl {cls}">{seg}</span>')
         else:
@@ -494,56 +417,90 @@ def gadget_srcdoc(*, html: str | None, css: str | None, js: str | None) -> str:
     )
 
 
-def render_shell(*, title: str, body_html: str) -> str:
-    generated_at = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
-    contact_name = _site_contact_name("")
-    contact_emails = _site_contact_emails(
-        ["gregb@ifost.org.au", "greg.baker@mq.edu.au", "greg.baker@anu.edu.au"]
-    )
-    contact_email_codes = [[ord(ch) for ch in e] for e in contact_emails]
-    contact_name_codes = [ord(ch) for ch in contact_name] if contact_name else []
-    banner_html = """
+_SHELL_BANNER_HTML = """
     <div class="banner warn">
       <span class="badge">Warning</span>
       This is a translation of A. Lentz’s reconstructed 19th‑century Teubner text of Herodian’s <em>De Prosodia Catholica</em> (not a continuous ancient original).
       <a href="/about/lentz.html">About the Lentz edition</a><span class="muted">.</span>
     </div>
-    """.strip()
-    return f"""<!doctype html>
+""".strip()
+
+# Page shell up to the escaped title, and from the title to the page body.
+_SHELL_OPEN = """<!doctype html>
 <html lang="en">
 <head>
   <meta charset="utf-8" />
   <meta name="viewport" content="width=device-width,initial-scale=1" />
-  <title>{escape(title)}</title>
+  <title>"""
+_SHELL_AFTER_TITLE = """</title>
   <link rel="stylesheet" href="/style.css" />
 </head>
 <body>
   <div class="wrap">
-    {banner_html}
-    {body_html}
+    """ + _SHELL_BANNER_HTML + """
+    """
+
+
+# Per-build values shared by every page; passage workers receive the parent's copy so all
+# pages of one build show the same timestamp.
+_BUILD_INFO: dict = {}
+
+
+def _build_generated_at() -> str:
+    # strftime with this fixed format cannot produce HTML metacharacters, so no escape().
+    if "generated_at" not in _BUILD_INFO:
+        _BUILD_INFO["generated_at"] = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
+    return _BUILD_INFO["generated_at"]
+
+
+# Contact details are shipped XOR-scrambled and base64-encoded (decoded in the browser on
+# click), which keeps them out of plain-text scrapes and is far shorter than char-code arrays.
+CONTACT_SCRAMBLE_KEY = 0x5A
+
+
+def _scramble_contact_text(text: str) -> str:
+    # base64 output is [A-Za-z0-9+/=] only, so it can sit inside a JS string literal as-is.
+    return base64.b64encode(bytes(b ^ CONTACT_SCRAMBLE_KEY for b in text.encode("utf-8"))).decode("ascii")
+
+
+@lru_cache(maxsize=1)
+def _shell_tail() -> str:
+    """
+    Footer and closing tags, shared by every page of one build (built once per process).
+    """
+    generated_at = _build_generated_at()
+    contact_name = _site_contact_name("")
+    contact_emails = _site_contact_emails(
+        ("gregb@ifost.org.au", "greg.baker@mq.edu.au", "greg.baker@anu.edu.au")
+    )
+    contact_name_blob = _scramble_contact_text(contact_name)
+    contact_emails_blob = _scramble_contact_text("\n".join(contact_emails))
+    return f"""
     <footer>
       <span id="contact-widget">
         <button class="btn tiny" id="contact-reveal" type="button">Contact</button>
         <span id="contact-details"></span>
         <noscript><span class="pending">Enable JavaScript to view.</span></noscript>
       </span>
-      <span class="meta"> · Generated: {escape(generated_at)}</span>
+      <span class="meta"> · Generated: {generated_at}</span>
       <script>
         (() => {{
           const btn = document.getElementById('contact-reveal');
           const out = document.getElementById('contact-details');
           if (!btn || !out) return;
-          const name = {json.dumps(contact_name_codes)};
-          const emails = {json.dumps(contact_email_codes)};
-          const decode = (arr) => arr.map((c) => String.fromCharCode(c)).join('');
+          const name = '{contact_name_blob}';
+          const emails = '{contact_emails_blob}';
+          const decode = (s) =>
+            s ? new TextDecoder().decode(Uint8Array.from(atob(s), (c) => c.charCodeAt(0) ^ {CONTACT_SCRAMBLE_KEY})) : '';
           let shown = false;
           function render() {{
             out.textContent = '';
             const parts = [];
-            if (name && name.length) parts.push(decode(name));
+            const nameText = decode(name);
+            if (nameText) parts.push(nameText);
             const emailLinks = [];
-            for (const e of emails) {{
-              const addr = decode(e);
+            for (const addr of decode(emails).split('\\n')) {{
+              if (!addr) continue;
               const a = document.createElement('a');
               a.href = 'mailto:' + addr;
               a.textContent = addr;
@@ -577,89 +534,24 @@ def render_shell(*, title: str, body_html: str) -> str:
 """
 
 
-def render_index(*, title: str, stats: dict, lines: list[dict], top_overlap_by_line: dict[int, dict]) -> str:
-    translated = stats["translated"]
-    summarized = stats["summarized"]
-    total = stats["total"]
-    percent = (translated / total * 100.0) if total else 0.0
-    percent_str = f"{percent:.1f}%"
-
-    stephanos_base_url = _stephanos_base_url("https://stephanos.symmachus.org")
-
-    rows_html = []
-    for row in lines:
-        line_id = row["id"]
-        ref = row["ref"]
-        slug = ref_to_slug(ref)
-        summary = row.get("summary") or ""
-        ref_major = row.get("ref_major")
-        ref_minor = row.get("ref_minor")
-
-        status_html = []
-        status_html.append(
-            '<span class="tag ok">translated</span>'
-            if row.get("english_translation")
-            else '<span class="tag todo">needs translation</span>'
-        )
-        status_html.append(
-            '<span class="tag ok">summarized</span>'
-            if row.get("summary")
-            else '<span class="tag todo">needs summary</span>'
-        )
-        status_cell = " ".join(status_html)
+def _shell_head(title: str) -> tuple[str, str, str]:
+    return _SHELL_OPEN, escape(title), _SHELL_AFTER_TITLE
 
-        overlap = top_overlap_by_line.get(line_id)
-        overlap_cell = "—"
-        char_cell = "—"
-        word_cell = "—"
-        char_val = ""
-        word_val = ""
-        if overlap:
-            lemma_id = int(overlap["stephanos_lemma_id"])
-            meineke_id = overlap.get("stephanos_meineke_id") or f"lemma {lemma_id}"
-            headword = overlap.get("stephanos_headword") or ""
-            url = stephanos_entry_url(base_url=stephanos_base_url, lemma_id=lemma_id)
-            label = (f"{meineke_id} {headword}").strip()
-            overlap_cell = f'<a href="{escape(url)}" target="_blank" rel="noopener">{escape(label)}</a>'
-            char_cell = f"{overlap['char_lcs_ratio']*100:.1f}%"
-            word_cell = f"{overlap['word_lcs_ratio']*100:.1f}%"
-            char_val = f"{overlap['char_lcs_ratio']*100:.6f}"
-            word_val = f"{overlap['word_lcs_ratio']*100:.6f}"
 
-        hay = f"{ref} {summary}"
-        if overlap:
-            hay += f" {overlap.get('stephanos_meineke_id') or ''} {overlap.get('stephanos_headword') or ''}"
+def render_shell(*, title: str, body_html: str) -> str:
+    return "".join((*_shell_head(title), body_html, _shell_tail()))
 
-        rows_html.append(
-            f"""
-            <tr data-hay="{escape(hay)}" data-ref-major="{escape(str(ref_major) if ref_major is not None else '')}" data-ref-minor="{escape(str(ref_minor) if ref_minor is not None else '')}" data-char="{escape(char_val)}" data-word="{escape(word_val)}">
-              <td class="ref"><a href="passages/{escape(slug)}.html">{escape(ref)}</a></td>
-              <td>{escape(summary) if summary else '<span class="pending">—</span>'}</td>
-              <td class="small">{status_cell}</td>
-              <td>{overlap_cell}</td>
-              <td class="small">{escape(char_cell)}</td>
-              <td class="small">{escape(word_cell)}</td>
-            </tr>
-            """.strip()
-        )
 
-    stats_json = escape(json.dumps(stats, ensure_ascii=False))
-    body = f"""
-    <header>
-      <h1>{escape(title)}</h1>
-      <div class="meta">
-        <span class="pill">{translated}/{total} translated</span>
-        <span class="pill">{summarized}/{total} summarized</span>
-        <span class="pill">{percent_str}</span>
-      </div>
-    </header>
-    <div class="controls">
+# Static parts of the index page body (controls, table head, sort/filter script) around the
+# dynamic header, rows and stats, so render_index only formats what changes.
+_INDEX_TABLE_OPEN = """    <div class="controls">
       <input id="q" type="search" placeholder="Filter by ref, summary, or overlap…" autocomplete="off" />
       <a class="btn" href="index.html">Index</a>
       <a class="btn" href="analysis/index.html">Analysis</a>
       <a class="btn" href="analysis/progress.html">Progress</a>
       <a class="btn" href="analysis/coverage.html">Coverage</a>
       <a class="btn" href="passages.json">Data (JSON)</a>
+      <a class="btn" href="passages.jsonl">Data (JSONL)</a>
       <a class="btn" href="https://github.com/solresol/prosodia-catholica" target="_blank" rel="noopener">GitHub</a>
     </div>
     <div class="table-wrap">
@@ -675,11 +567,15 @@ def render_index(*, title: str, stats: dict, lines: list[dict], top_overlap_by_l
           </tr>
         </thead>
         <tbody>
-          {"".join(rows_html)}
+          """
+
+_INDEX_STATS_OPEN = """
         </tbody>
       </table>
     </div>
-    <div class="meta">Stats: <code id="stats">{stats_json}</code></div>
+    <div class="meta">Stats: <code id="stats">"""
+
+_INDEX_TAIL = """</code></div>
     <script>
       const q = document.getElementById('q');
       const rows = Array.from(document.querySelectorAll('#tbl tbody tr'));
@@ -688,18 +584,21 @@ def render_index(*, title: str, stats: dict, lines: list[dict], top_overlap_by_l
       let sortKey = 'ref';
       let sortDir = 1; // 1=asc, -1=desc
 
-      function norm(s){{ return (s||'').toLowerCase(); }}
-      function apply(){{
-        const needle = norm(q.value).trim();
-        for (const el of rows){{
-          if (!needle){{ el.style.display = ''; continue; }}
-          const hay = norm(el.getAttribute('data-hay') || el.innerText);
-          el.style.display = hay.includes(needle) ? '' : 'none';
-        }}
-      }}
-      q.addEventListener('input', apply);
-
-      function refParts(row){{
+      // data-hay is lowercased at build time, so filtering only reads an attribute per row.
+      let pendingFrame = 0;
+      function apply(){
+        pendingFrame = 0;
+        const needle = (q.value || '').toLowerCase().trim();
+        for (const el of rows){
+          if (!needle){ el.style.display = ''; continue; }
+          el.style.display = (el.dataset.hay || '').includes(needle) ? '' : 'none';
+        }
+      }
+      q.addEventListener('input', () => {
+        if (!pendingFrame) pendingFrame = requestAnimationFrame(apply);
+      });
+
+      function refParts(row){
         const maj = parseInt(row.dataset.refMajor || '', 10);
         const min = parseInt(row.dataset.refMinor || '', 10);
         if (Number.isFinite(maj) && Number.isFinite(min)) return [maj, min];
@@ -707,31 +606,31 @@ def render_index(*, title: str, stats: dict, lines: list[dict], top_overlap_by_l
         const m = refText.match(/^(\\d+)\\.(\\d+)$/);
         if (m) return [parseInt(m[1], 10), parseInt(m[2], 10)];
         return [1e9, 1e9];
-      }}
+      }
 
-      function metricVal(row, key){{
+      function metricVal(row, key){
         const v = parseFloat(row.dataset[key] || '');
         return Number.isFinite(v) ? v : null;
-      }}
+      }
 
-      function compareRows(a, b){{
-        if (sortKey === 'ref') {{
+      function compareRows(a, b){
+        if (sortKey === 'ref') {
           const [am, an] = refParts(a);
           const [bm, bn] = refParts(b);
           if (am !== bm) return (am - bm) * sortDir;
           if (an !== bn) return (an - bn) * sortDir;
           return a.innerText.localeCompare(b.innerText) * sortDir;
-        }}
-        if (sortKey === 'char' || sortKey === 'word') {{
+        }
+        if (sortKey === 'char' || sortKey === 'word') {
           const av = metricVal(a, sortKey);
           const bv = metricVal(b, sortKey);
-          if (av === null && bv === null) {{
+          if (av === null && bv === null) {
             const [am, an] = refParts(a);
             const [bm, bn] = refParts(b);
             if (am !== bm) return am - bm;
             if (an !== bn) return an - bn;
             return 0;
-          }}
+          }
           if (av === null) return 1; // missing always last
           if (bv === null) return -1;
           if (av !== bv) return (av - bv) * sortDir;
@@ -740,42 +639,255 @@ def render_index(*, title: str, stats: dict, lines: list[dict], top_overlap_by_l
           if (am !== bm) return am - bm;
           if (an !== bn) return an - bn;
           return 0;
-        }}
+        }
         return 0;
-      }}
+      }
 
-      function renderSortIndicators(){{
-        for (const th of headers){{
+      function renderSortIndicators(){
+        for (const th of headers){
           const arrow = th.querySelector('.arrow');
           if (!arrow) continue;
-          if (th.dataset.sort === sortKey) {{
+          if (th.dataset.sort === sortKey) {
             arrow.textContent = sortDir === 1 ? '▲' : '▼';
-          }} else {{
+          } else {
             arrow.textContent = '';
-          }}
-        }}
-      }}
+          }
+        }
+      }
 
-      function sortBy(key){{
-        if (sortKey === key) {{
+      function sortBy(key){
+        if (sortKey === key) {
           sortDir *= -1;
-        }} else {{
+        } else {
           sortKey = key;
           sortDir = (key === 'ref') ? 1 : -1; // metrics default desc
-        }}
+        }
         rows.sort(compareRows);
         for (const el of rows) tbody.appendChild(el);
         renderSortIndicators();
-      }}
+      }
 
-      for (const th of headers){{
+      for (const th of headers){
         th.addEventListener('click', () => sortBy(th.dataset.sort));
-      }}
+      }
       renderSortIndicators();
-    </script>
-    """.strip()
+    </script>"""
+
+
+# Constant pieces of an index table row, in output order; the row loop appends these and the
+# escaped cell values to one list that is joined once.
+_ROW_OPEN = '<tr data-hay="'
+_ROW_REF_MAJOR = '" data-ref-major="'
+_ROW_REF_MINOR = '" data-ref-minor="'
+_ROW_CHAR_VAL = '" data-char="'
+_ROW_WORD_VAL = '" data-word="'
+_ROW_REF_LINK = '">\n              <td class="ref"><a href="passages/'
+_ROW_REF_TEXT = '.html">'
+_ROW_SUMMARY = "</a></td>\n              <td>"
+_ROW_SUMMARY_PENDING = '<span class="pending">—</span>'
+_ROW_STATUS = '</td>\n              <td class="small">'
+_ROW_TRANSLATED = '<span class="tag ok">translated</span>'
+_ROW_NEEDS_TRANSLATION = '<span class="tag todo">needs translation</span>'
+_ROW_SUMMARIZED = '<span class="tag ok">summarized</span>'
+_ROW_NEEDS_SUMMARY = '<span class="tag todo">needs summary</span>'
+_ROW_OVERLAP = "</td>\n              <td>"
+_ROW_CHAR = '</td>\n              <td class="small">'
+_ROW_WORD = '</td>\n              <td class="small">'
+_ROW_CLOSE = "</td>\n            </tr>"
+
+# Short index cells that repeat across rows (overlap links and labels, unusual refs);
+# per-row unique text such as summaries is escaped directly.
+_escape_cached = lru_cache(maxsize=16384)(escape)
+
+
+def render_index(
+    *,
+    title: str,
+    stats: dict,
+    lines: list[dict],
+    top_overlap_by_line: dict[int, dict],
+    slugs: list[str] | None = None,
+) -> str:
+    """
+    `slugs`, when given, holds ref_to_slug(row["ref"]) for each row of `lines`, in order.
+    """
+    translated = stats["translated"]
+    summarized = stats["summarized"]
+    total = stats["total"]
+    percent = (translated / total * 100.0) if total else 0.0
+    percent_str = f"{percent:.1f}%"
 
-    return render_shell(title=title, body_html=body)
+    stephanos_base_url = _stephanos_base_url("https://stephanos.symmachus.org")
+
+    header_html = f"""<header>
+      <h1>{escape(title)}</h1>
+      <div class="meta">
+        <span class="pill">{translated}/{total} translated</span>
+        <span class="pill">{summarized}/{total} summarized</span>
+        <span class="pill">{percent_str}</span>
+      </div>
+    </header>
+"""
+
+    # The whole page (shell included) goes into one list joined once at the end, rather than
+    # joining rows, then the body, then the shell around it.
+    out: list[str] = [*_shell_head(title), header_html, _INDEX_TABLE_OPEN]
+    # Hot-loop names bound to locals: the loop body then avoids global and attribute lookups.
+    # Ref parts, slugs (see ref_to_slug) and formatted percentages cannot contain HTML
+    # metacharacters and are appended as-is; refs only go through escape when not plainly safe.
+    append = out.append
+    escape_text = escape
+    escape_cached = _escape_cached
+    is_safe = _is_html_safe
+    get_overlap = top_overlap_by_line.get
+    if slugs is None:
+        slugs = [ref_to_slug(row["ref"]) for row in lines]
+    for row, slug in zip(lines, slugs):
+        line_id = row["id"]
+        ref = row["ref"]
+        summary = row.get("summary") or ""
+        ref_major = row.get("ref_major")
+        ref_minor = row.get("ref_minor")
+
+        overlap = get_overlap(line_id)
+        overlap_cell = "—"
+        char_cell = "—"
+        word_cell = "—"
+        char_val = ""
+        word_val = ""
+        if overlap:
+            lemma_id = int(overlap["stephanos_lemma_id"])
+            meineke_id = overlap.get("stephanos_meineke_id") or f"lemma {lemma_id}"
+            headword = overlap.get("stephanos_headword") or ""
+            url = stephanos_entry_url(base_url=stephanos_base_url, lemma_id=lemma_id)
+            label = (f"{meineke_id} {headword}").strip()
+            overlap_cell = f'<a href="{escape_cached(url)}" target="_blank" rel="noopener">{escape_cached(label)}</a>'
+            char_pct = overlap["char_lcs_ratio"] * 100
+            word_pct = overlap["word_lcs_ratio"] * 100
+            char_cell = f"{char_pct:.1f}%"
+            word_cell = f"{word_pct:.1f}%"
+            char_val = f"{char_pct:.6f}"
+            word_val = f"{word_pct:.6f}"
+
+        hay = f"{ref} {summary}"
+        if overlap:
+            hay += f" {overlap.get('stephanos_meineke_id') or ''} {overlap.get('stephanos_headword') or ''}"
+
+        append(_ROW_OPEN)
+        append(escape_text(hay.lower()))
+        append(_ROW_REF_MAJOR)
+        append(str(ref_major) if ref_major is not None else "")
+        append(_ROW_REF_MINOR)
+        append(str(ref_minor) if ref_minor is not None else "")
+        append(_ROW_CHAR_VAL)
+        append(char_val)
+        append(_ROW_WORD_VAL)
+        append(word_val)
+        append(_ROW_REF_LINK)
+        append(slug)
+        append(_ROW_REF_TEXT)
+        append(ref if is_safe(ref) else escape_cached(ref))
+        append(_ROW_SUMMARY)
+        append(escape_text(summary) if summary else _ROW_SUMMARY_PENDING)
+        append(_ROW_STATUS)
+        append(_ROW_TRANSLATED if row.get("english_translation") else _ROW_NEEDS_TRANSLATION)
+        append(" ")
+        append(_ROW_SUMMARIZED if summary else _ROW_NEEDS_SUMMARY)
+        append(_ROW_OVERLAP)
+        append(overlap_cell)
+        append(_ROW_CHAR)
+        append(char_cell)
+        append(_ROW_WORD)
+        append(word_cell)
+        append(_ROW_CLOSE)
+    append(_INDEX_STATS_OPEN)
+    append(escape(json.dumps(stats, ensure_ascii=False)))
+    append(_INDEX_TAIL)
+    append(_shell_tail())
+    return "".join(out)
+
+
+class PassageRenderCache:
+    """
+    Rendered passage bodies keyed by a hash of everything they are built from, so incremental
+    rebuilds only re-render passages whose text, translation, gadget or overlaps changed.
+
+    Only the page body is cached; the shell (with its build timestamp) is added on every build.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.used: set[str] = set()
+
+    def key(self, inputs: tuple) -> str:
+        digest = hashlib.sha256(_source_fingerprint().encode("ascii"))
+        digest.update(repr(inputs).encode("utf-8"))
+        return digest.hexdigest()[:32]
+
+    def get(self, key: str) -> str | None:
+        self.used.add(key)
+        try:
+            return (self.directory / f"{key}.html").read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, body_html: str) -> None:
+        # Write to a scratch file and rename, so an interrupted run never leaves a partial entry.
+        tmp_path = self.directory / f".{key}.{os.getpid()}"
+        tmp_path.write_text(body_html, encoding="utf-8")
+        os.replace(tmp_path, self.directory / f"{key}.html")
+
+    def prune(self) -> None:
+        """
+        Delete entries not used by this build (passages that changed or disappeared).
+        """
+        for path in self.directory.glob("*.html"):
+            if path.stem not in self.used:
+                path.unlink(missing_ok=True)
+
+
+@lru_cache(maxsize=1)
+def _source_fingerprint() -> str:
+    # Cached renders are only valid for the code that produced them.
+    return hashlib.sha1(Path(__file__).read_bytes()).hexdigest()
+
+
+# Highlight colour classes (style.css .c0-.c9), assigned to a passage's overlaps in order.
+_HIGHLIGHT_PALETTE = ("c0", "c1", "c2", "c3", "c4", "c5", "c6", "c7", "c8", "c9")
+
+# One overlap on a passage page; every slot is filled with already-escaped HTML or numbers.
+_OVERLAP_ROW_TEMPLATE = """<div class="row">
+              <div class="row-head">
+                <div class="ref">{swatch}<a href="{url}" target="_blank" rel="noopener">{label}</a></div>
+                <div class="kvs">
+                  <span class="kv">char LCS {char_lcs_len} ({char_pct})</span>
+                  <span class="kv">word LCS {word_lcs_len} ({word_pct})</span>
+                </div>
+              </div>
+              <details>
+                <summary>Show overlap highlight</summary>
+                <div class="grid">
+                  <pre class="greek" lang="el">{herodian_snippet}</pre>
+                  <pre class="greek" lang="el">{stephanos_snippet}</pre>
+                </div>
+              </details>
+            </div>"""
+
+# Overlap fields render_passage reads; the render cache key covers exactly these.
+_PASSAGE_OVERLAP_FIELDS = (
+    "stephanos_lemma_id",
+    "stephanos_meineke_id",
+    "stephanos_headword",
+    "char_lcs_len",
+    "char_lcs_ratio",
+    "word_lcs_len",
+    "word_lcs_ratio",
+    "herodian_char_start",
+    "herodian_char_end",
+    "stephanos_char_start",
+    "stephanos_char_end",
+)
 
 
 def render_passage(
@@ -790,13 +902,72 @@ def render_passage(
     gadget_js: str | None,
     overlaps: list[dict],
     stephanos_text_by_lemma_id: dict[int, dict],
+    render_cache: PassageRenderCache | None = None,
 ) -> str:
     title = f"{site_title} — {ref}"
     stephanos_base_url = _stephanos_base_url("https://stephanos.symmachus.org")
 
-    highlight_palette = ["c0", "c1", "c2", "c3", "c4", "c5", "c6", "c7", "c8", "c9"]
-    for i, ov in enumerate(overlaps):
-        ov["_color_cls"] = highlight_palette[i % len(highlight_palette)]
+    cache_key = None
+    if render_cache is not None:
+        # Overlaps keep their order: it decides each overlap's highlight colour.
+        cache_key = render_cache.key(
+            (
+                site_title,
+                ref,
+                summary,
+                greek_text,
+                english_translation,
+                gadget_html,
+                gadget_css,
+                gadget_js,
+                stephanos_base_url,
+                [tuple(ov.get(field) for field in _PASSAGE_OVERLAP_FIELDS) for ov in overlaps],
+                [
+                    stephanos_text_by_lemma_id.get(int(ov["stephanos_lemma_id"]), {}).get("text_body")
+                    for ov in overlaps
+                ],
+            )
+        )
+        body = render_cache.get(cache_key)
+        if body is not None:
+            return render_shell(title=title, body_html=body)
+
+    body = _render_passage_body(
+        site_title=site_title,
+        ref=ref,
+        summary=summary,
+        greek_text=greek_text,
+        english_translation=english_translation,
+        gadget_html=gadget_html,
+        gadget_css=gadget_css,
+        gadget_js=gadget_js,
+        overlaps=overlaps,
+        stephanos_text_by_lemma_id=stephanos_text_by_lemma_id,
+        stephanos_base_url=stephanos_base_url,
+    )
+    if render_cache is not None:
+        render_cache.put(cache_key, body)
+    return render_shell(title=title, body_html=body)
+
+
+def _render_passage_body(
+    *,
+    site_title: str,
+    ref: str,
+    summary: str | None,
+    greek_text: str,
+    english_translation: str | None,
+    gadget_html: str | None,
+    gadget_css: str | None,
+    gadget_js: str | None,
+    overlaps: list[dict],
+    stephanos_text_by_lemma_id: dict[int, dict],
+    stephanos_base_url: str,
+) -> str:
+    esc_ref = escape(ref)
+
+    # Colour per overlap position; kept local so the caller's overlap dicts are not modified.
+    color_classes = [_HIGHLIGHT_PALETTE[i % len(_HIGHLIGHT_PALETTE)] for i in range(len(overlaps))]
 
     greek_html = highlight_many_html(
         greek_text or "",
@@ -804,26 +975,27 @@ def render_passage(
             {
                 "start": ov.get("herodian_char_start"),
                 "end": ov.get("herodian_char_end"),
-                "cls": ov.get("_color_cls"),
+                "cls": color_cls,
                 "priority": ov.get("char_lcs_len") or 0,
             }
-            for ov in overlaps
+            for ov, color_cls in zip(overlaps, color_classes)
         ],
     )
 
     overlaps_html = []
-    for ov in overlaps:
+    for ov, color_cls in zip(overlaps, color_classes):
         lemma_id = int(ov["stephanos_lemma_id"])
         meineke_id = ov.get("stephanos_meineke_id") or ""
         headword = ov.get("stephanos_headword") or ""
+        # safe: integer LCS lengths and these percentages are inlined without escape()
         char_pct = f"{ov['char_lcs_ratio']*100:.1f}%"
         word_pct = f"{ov['word_lcs_ratio']*100:.1f}%"
         stephanos_text = stephanos_text_by_lemma_id.get(lemma_id, {}).get("text_body") or ""
         stephanos_url = stephanos_entry_url(base_url=stephanos_base_url, lemma_id=lemma_id)
-        color_cls = (ov.get("_color_cls") or "").strip()
 
         label = (f"{meineke_id} {headword}").strip() or f"lemma {lemma_id}"
-        swatch = f'<span class="swatch {escape(color_cls)}"></span>' if color_cls else ""
+        # safe: palette class name from _HIGHLIGHT_PALETTE
+        swatch = f'<span class="swatch {color_cls}"></span>' if color_cls else ""
         herodian_snippet = highlight_snippet_html(
             greek_text or "",
             start=ov.get("herodian_char_start"),
@@ -840,24 +1012,17 @@ def render_passage(
         )
 
         overlaps_html.append(
-            f"""
-            <div class="row">
-              <div class="row-head">
-                <div class="ref">{swatch}<a href="{escape(stephanos_url)}" target="_blank" rel="noopener">{escape(label)}</a></div>
-                <div class="kvs">
-                  <span class="kv">char LCS {escape(str(ov['char_lcs_len']))} ({escape(char_pct)})</span>
-                  <span class="kv">word LCS {escape(str(ov['word_lcs_len']))} ({escape(word_pct)})</span>
-                </div>
-              </div>
-              <details>
-                <summary>Show overlap highlight</summary>
-                <div class="grid">
-                  <pre class="greek" lang="el">{herodian_snippet}</pre>
-                  <pre class="greek" lang="el">{stephanos_snippet}</pre>
-                </div>
-              </details>
-            </div>
-            """.strip()
+            _OVERLAP_ROW_TEMPLATE.format(
+                swatch=swatch,
+                url=escape(stephanos_url),
+                label=escape(label),
+                char_lcs_len=ov["char_lcs_len"],
+                char_pct=char_pct,
+                word_lcs_len=ov["word_lcs_len"],
+                word_pct=word_pct,
+                herodian_snippet=herodian_snippet,
+                stephanos_snippet=stephanos_snippet,
+            )
         )
 
     overlaps_block = (
@@ -876,14 +1041,14 @@ def render_passage(
 
     body = f"""
     <header>
-      <h1><a href="../index.html">{escape(site_title)}</a></h1>
-      <div class="meta"><span class="pill">Passage {escape(ref)}</span></div>
+      <h1><a href="../index.html">{_escape_cached(site_title)}</a></h1>
+      <div class="meta"><span class="pill">Passage {esc_ref}</span></div>
     </header>
     <div class="controls">
       <a class="btn" href="../index.html">← Index</a>
     </div>
 	    <div class="row">
-	      <div class="ref">{escape(ref)}</div>
+	      <div class="ref">{esc_ref}</div>
 	      <div class="summary">{escape(summary) if summary else '<span class="pending">No summary yet</span>'}</div>
 	      <div class="grid">
 	        <div class="greek" lang="el">{greek_html}</div>
@@ -899,7 +1064,7 @@ def render_passage(
     {overlaps_block}
     """.strip()
 
-    return render_shell(title=title, body_html=body)
+    return body
 
 
 def render_about_lentz(*, site_title: str) -> str:
@@ -953,20 +1118,156 @@ def render_about_lentz(*, site_title: str) -> str:
     return render_shell(title=title, body_html=body)
 
 
-def _greek_casefold_strip(text: str) -> str:
-    s = (text or "").casefold()
-    s = unicodedata.normalize("NFD", s)
-    out = []
-    for ch in s:
+class _CasefoldStripTable(dict):
+    """
+    str.translate table for _greek_casefold_strip, filled lazily: the first time a code point
+    is seen it is classified (combining mark -> dropped, letter -> kept, anything else -> space)
+    and the result is cached, so later passes stay inside str.translate.
+    """
+
+    def __missing__(self, cp: int) -> int | None:
+        ch = chr(cp)
         if unicodedata.combining(ch):
-            continue
-        if ch == "ϲ":
-            ch = "σ"
-        if unicodedata.category(ch).startswith("L"):
-            out.append(ch)
+            value = None
+        elif ch == "ϲ":
+            value = ord("σ")
+        elif unicodedata.category(ch).startswith("L"):
+            value = cp
         else:
-            out.append(" ")
-    return " ".join("".join(out).split())
+            value = 0x20
+        self[cp] = value
+        return value
+
+
+_CASEFOLD_STRIP_TABLE = _CasefoldStripTable()
+
+
+def _greek_casefold_strip(text: str) -> str:
+    s = unicodedata.normalize("NFD", (text or "").casefold())
+    return " ".join(s.translate(_CASEFOLD_STRIP_TABLE).split())
+
+
+# Fixed rows of the progress page's "Recurring Daily Tasks" table (steps 0-1 and 5); only the
+# overlap (3c) and site generation (4) rows carry per-build values.
+_RECURRING_ROWS_BEFORE_OVERLAPS = (
+    "<tr><td class='small'>0</td><td>git pull (if clean)</td><td class='small'>daily</td>"
+    "<td class='small'>no backlog</td><td class='small'>next cron run</td>"
+    "<td>Runs only when working tree is clean.</td></tr>"
+    "<tr><td class='small'>1</td><td>init_db.py</td><td class='small'>daily</td>"
+    "<td class='small'>no backlog</td><td class='small'>same run</td>"
+    "<td>Idempotent schema/grants check.</td></tr>"
+)
+_RECURRING_ROW_DEPLOY = (
+    "<tr><td class='small'>5</td><td>rsync deploy</td><td class='small'>daily</td>"
+    "<td class='small'>no backlog</td><td class='small'>immediately after step 4</td>"
+    "<td>Deploy target: configured in config.py (DEPLOY_HOST/DEPLOY_PATH).</td></tr>"
+)
+
+
+def _fmt_int(n: int | None) -> str:
+    if n is None:
+        return "—"
+    return f"{int(n):,}"
+
+
+def _fmt_estimate(
+    est: dict[str, int | datetime | None] | None,
+) -> tuple[str, str, str]:
+    if not est:
+        return "—", "—", "unknown"
+    remaining = int(est.get("remaining") or 0)
+    days_left = est.get("days_left")
+    eta = est.get("eta")
+    runs_left = est.get("runs_left")
+    if remaining <= 0:
+        return "0", "0", "complete"
+    runs_text = "—" if runs_left is None else str(int(runs_left))
+    days_text = "—" if days_left is None else str(int(days_left))
+    if eta is None:
+        return runs_text, days_text, "blocked (limit=0)"
+    return runs_text, days_text, _fmt_utc(_to_utc(eta))
+
+
+def _backlog_row(
+    *,
+    step: str,
+    script: str,
+    progress: str,
+    remaining: str,
+    capacity: str,
+    estimate: tuple[str, str, str],
+    last_at: datetime | None,
+    note_html: str,
+) -> str:
+    runs_text, days_text, eta_text = estimate
+    cells = (
+        progress,
+        remaining,
+        capacity,
+        escape(runs_text),
+        escape(days_text),
+        escape(eta_text),
+        escape(_fmt_utc(last_at)),
+    )
+    return "".join(
+        (
+            f"<tr><td class='small'>{step}</td><td>{script}</td>",
+            *(f"<td class='small'>{cell}</td>" for cell in cells),
+            f"<td>{note_html}</td></tr>",
+        )
+    )
+
+
+def _fmt_seconds(seconds: float | int | None) -> str:
+    if seconds is None:
+        return "—"
+    sec = max(0, int(round(float(seconds))))
+    h, rem = divmod(sec, 3600)
+    m, s = divmod(rem, 60)
+    if h:
+        return f"{h}h {m}m {s}s"
+    if m:
+        return f"{m}m {s}s"
+    return f"{s}s"
+
+
+_PROGRESS_BODY_TEMPLATE = """
+    <header>
+      <h1><a href="../index.html">{site_title}</a></h1>
+      <div class="meta"><span class="pill">Progress</span> <span class="pill">cron cadence: {cadence}</span></div>
+    </header>
+    <div class="controls">
+      <a class="btn" href="../index.html">← Index</a>
+      <a class="btn" href="index.html">Analysis</a>
+      <a class="btn" href="coverage.html">Coverage</a>
+    </div>
+    <div class="row">
+      <div class="summary">{overall_eta_html}</div>
+    </div>
+    <h2>Backlog Tasks (ETA)</h2>
+    <div class="table-wrap">
+      <table class="tbl">
+        <thead>
+          <tr>
+            <th>Step</th><th>Task</th><th>Done/Total</th><th>Remaining</th><th>Capacity</th><th>Runs left</th><th>Days left</th><th>ETA (UTC)</th><th>Last success</th><th>Notes</th>
+          </tr>
+        </thead>
+        <tbody>{backlog_rows}</tbody>
+      </table>
+    </div>
+    <h2>Recurring Daily Tasks</h2>
+    <div class="table-wrap">
+      <table class="tbl">
+        <thead>
+          <tr><th>Step</th><th>Task</th><th>Schedule</th><th>Backlog</th><th>ETA</th><th>Notes</th></tr>
+        </thead>
+        <tbody>{recurring_rows}</tbody>
+      </table>
+    </div>
+    <div class="row">
+      <div class="summary">Estimates assume fixed per-run limits and regular cron execution ({cadence}).</div>
+    </div>
+    """
 
 
 def _render_progress_page(*, site_title: str, progress_data: dict) -> str:
@@ -991,28 +1292,6 @@ def _render_progress_page(*, site_title: str, progress_data: dict) -> str:
         max(0, int(source_tsv_rows_raw)) if source_tsv_rows_raw is not None else None
     )
 
-    def _fmt_int(n: int | None) -> str:
-        if n is None:
-            return "—"
-        return f"{int(n):,}"
-
-    def _fmt_estimate(
-        est: dict[str, int | datetime | None] | None,
-    ) -> tuple[str, str, str]:
-        if not est:
-            return "—", "—", "unknown"
-        remaining = int(est.get("remaining") or 0)
-        days_left = est.get("days_left")
-        eta = est.get("eta")
-        runs_left = est.get("runs_left")
-        if remaining <= 0:
-            return "0", "0", "complete"
-        runs_text = "—" if runs_left is None else str(int(runs_left))
-        days_text = "—" if days_left is None else str(int(days_left))
-        if eta is None:
-            return runs_text, days_text, "blocked (limit=0)"
-        return runs_text, days_text, _fmt_utc(_to_utc(eta))
-
     backlog_rows: list[str] = []
     backlog_estimates: list[dict[str, int | datetime | None]] = []
     blocked_tasks: list[str] = []
@@ -1030,29 +1309,30 @@ def _render_progress_page(*, site_title: str, progress_data: dict) -> str:
             blocked_tasks.append("import")
         if import_remaining > 0:
             backlog_estimates.append(import_est)
-        import_runs, import_days, import_eta = _fmt_estimate(import_est)
         backlog_rows.append(
-            f"<tr><td class='small'>2</td><td>import_herodian_tsv.py</td>"
-            f"<td class='small'>{_fmt_int(import_done)}/{_fmt_int(source_tsv_rows)}</td>"
-            f"<td class='small'>{_fmt_int(import_remaining)}</td>"
-            f"<td class='small'>full file</td>"
-            f"<td class='small'>{escape(import_runs)}</td>"
-            f"<td class='small'>{escape(import_days)}</td>"
-            f"<td class='small'>{escape(import_eta)}</td>"
-            f"<td class='small'>{escape(_fmt_utc(progress_data.get('latest_imported_at')))}</td>"
-            f"<td>TSV source rows known.</td></tr>"
+            _backlog_row(
+                step="2",
+                script="import_herodian_tsv.py",
+                progress=f"{_fmt_int(import_done)}/{_fmt_int(source_tsv_rows)}",
+                remaining=_fmt_int(import_remaining),
+                capacity="full file",
+                estimate=_fmt_estimate(import_est),
+                last_at=progress_data.get("latest_imported_at"),
+                note_html="TSV source rows known.",
+            )
         )
     else:
         backlog_rows.append(
-            f"<tr><td class='small'>2</td><td>import_herodian_tsv.py</td>"
-            f"<td class='small'>{_fmt_int(total_all)}/?</td>"
-            f"<td class='small'>—</td>"
-            f"<td class='small'>full file</td>"
-            f"<td class='small'>—</td>"
-            f"<td class='small'>—</td>"
-            f"<td class='small'>unknown (TSV missing)</td>"
-            f"<td class='small'>{escape(_fmt_utc(progress_data.get('latest_imported_at')))}</td>"
-            f"<td>TSV source file not found on this host.</td></tr>"
+            _backlog_row(
+                step="2",
+                script="import_herodian_tsv.py",
+                progress=f"{_fmt_int(total_all)}/?",
+                remaining="—",
+                capacity="full file",
+                estimate=("—", "—", "unknown (TSV missing)"),
+                last_at=progress_data.get("latest_imported_at"),
+                note_html="TSV source file not found on this host.",
+            )
         )
 
     translation_remaining = max(0, total_translatable - translated_done)
@@ -1066,17 +1346,17 @@ def _render_progress_page(*, site_title: str, progress_data: dict) -> str:
         backlog_estimates.append(translation_est)
     if translation_remaining > 0 and translation_est.get("eta") is None:
         blocked_tasks.append("translation")
-    trans_runs, trans_days, trans_eta = _fmt_estimate(translation_est)
     backlog_rows.append(
-        f"<tr><td class='small'>3</td><td>translate_lines.py</td>"
-        f"<td class='small'>{_fmt_int(translated_done)}/{_fmt_int(total_translatable)}</td>"
-        f"<td class='small'>{_fmt_int(translation_remaining)}</td>"
-        f"<td class='small'>{_fmt_int(translation_limit)}/run</td>"
-        f"<td class='small'>{escape(trans_runs)}</td>"
-        f"<td class='small'>{escape(trans_days)}</td>"
-        f"<td class='small'>{escape(trans_eta)}</td>"
-        f"<td class='small'>{escape(_fmt_utc(progress_data.get('latest_translated_at')))}</td>"
-        f"<td>Scope excludes ref E and major 0.</td></tr>"
+        _backlog_row(
+            step="3",
+            script="translate_lines.py",
+            progress=f"{_fmt_int(translated_done)}/{_fmt_int(total_translatable)}",
+            remaining=_fmt_int(translation_remaining),
+            capacity=f"{_fmt_int(translation_limit)}/run",
+            estimate=_fmt_estimate(translation_est),
+            last_at=progress_data.get("latest_translated_at"),
+            note_html="Scope excludes ref E and major 0.",
+        )
     )
 
     summary_remaining = max(0, total_non_e - summarized_done)
@@ -1090,17 +1370,17 @@ def _render_progress_page(*, site_title: str, progress_data: dict) -> str:
         backlog_estimates.append(summary_est)
     if summary_remaining > 0 and summary_est.get("eta") is None:
         blocked_tasks.append("summary")
-    sum_runs, sum_days, sum_eta = _fmt_estimate(summary_est)
     backlog_rows.append(
-        f"<tr><td class='small'>3b</td><td>summarize_lines.py</td>"
-        f"<td class='small'>{_fmt_int(summarized_done)}/{_fmt_int(total_non_e)}</td>"
-        f"<td class='small'>{_fmt_int(summary_remaining)}</td>"
-        f"<td class='small'>{_fmt_int(summary_limit)}/run</td>"
-        f"<td class='small'>{escape(sum_runs)}</td>"
-        f"<td class='small'>{escape(sum_days)}</td>"
-        f"<td class='small'>{escape(sum_eta)}</td>"
-        f"<td class='small'>{escape(_fmt_utc(progress_data.get('latest_summarized_at')))}</td>"
-        f"<td>Scope excludes ref E.</td></tr>"
+        _backlog_row(
+            step="3b",
+            script="summarize_lines.py",
+            progress=f"{_fmt_int(summarized_done)}/{_fmt_int(total_non_e)}",
+            remaining=_fmt_int(summary_remaining),
+            capacity=f"{_fmt_int(summary_limit)}/run",
+            estimate=_fmt_estimate(summary_est),
+            last_at=progress_data.get("latest_summarized_at"),
+            note_html="Scope excludes ref E.",
+        )
     )
 
     gadget_remaining = max(0, total_translatable - gadget_done)
@@ -1114,17 +1394,20 @@ def _render_progress_page(*, site_title: str, progress_data: dict) -> str:
         backlog_estimates.append(gadget_est)
     if gadget_remaining > 0 and gadget_est.get("eta") is None:
         blocked_tasks.append("gadget")
-    gad_runs, gad_days, gad_eta = _fmt_estimate(gadget_est)
     backlog_rows.append(
-        f"<tr><td class='small'>3bb</td><td>gadgetize_lines.py</td>"
-        f"<td class='small'>{_fmt_int(gadget_done)}/{_fmt_int(total_translatable)}</td>"
-        f"<td class='small'>{_fmt_int(gadget_remaining)}</td>"
-        f"<td class='small'>{_fmt_int(gadget_limit)}/run</td>"
-        f"<td class='small'>{escape(gad_runs)}</td>"
-        f"<td class='small'>{escape(gad_days)}</td>"
-        f"<td class='small'>{escape(gad_eta)}</td>"
-        f"<td class='small'>{escape(_fmt_utc(progress_data.get('latest_gadget_generated_at')))}</td>"
-        f"<td>{_fmt_int(gadget_ready_pending)} ready; {_fmt_int(gadget_blocked_translation)} blocked on translation.</td></tr>"
+        _backlog_row(
+            step="3bb",
+            script="gadgetize_lines.py",
+            progress=f"{_fmt_int(gadget_done)}/{_fmt_int(total_translatable)}",
+            remaining=_fmt_int(gadget_remaining),
+            capacity=f"{_fmt_int(gadget_limit)}/run",
+            estimate=_fmt_estimate(gadget_est),
+            last_at=progress_data.get("latest_gadget_generated_at"),
+            note_html=(
+                f"{_fmt_int(gadget_ready_pending)} ready; "
+                f"{_fmt_int(gadget_blocked_translation)} blocked on translation."
+            ),
+        )
     )
 
     if blocked_tasks:
@@ -1152,25 +1435,8 @@ def _render_progress_page(*, site_title: str, progress_data: dict) -> str:
     overlap_duration = progress_data.get("latest_overlap_duration_seconds")
     overlap_avg_duration = progress_data.get("overlap_avg_duration_seconds")
 
-    def _fmt_seconds(seconds: float | int | None) -> str:
-        if seconds is None:
-            return "—"
-        sec = max(0, int(round(float(seconds))))
-        h, rem = divmod(sec, 3600)
-        m, s = divmod(rem, 60)
-        if h:
-            return f"{h}h {m}m {s}s"
-        if m:
-            return f"{m}m {s}s"
-        return f"{s}s"
-
     recurring_rows = [
-        "<tr><td class='small'>0</td><td>git pull (if clean)</td><td class='small'>daily</td>"
-        "<td class='small'>no backlog</td><td class='small'>next cron run</td>"
-        "<td>Runs only when working tree is clean.</td></tr>",
-        "<tr><td class='small'>1</td><td>init_db.py</td><td class='small'>daily</td>"
-        "<td class='small'>no backlog</td><td class='small'>same run</td>"
-        "<td>Idempotent schema/grants check.</td></tr>",
+        _RECURRING_ROWS_BEFORE_OVERLAPS,
         (
             f"<tr><td class='small'>3c</td><td>compute_overlaps.py</td><td class='small'>daily full pass</td>"
             f"<td class='small'>no backlog</td><td class='small'>same run</td>"
@@ -1182,58 +1448,26 @@ def _render_progress_page(*, site_title: str, progress_data: dict) -> str:
         "<tr><td class='small'>4</td><td>generate_site.py</td><td class='small'>daily</td>"
         "<td class='small'>no backlog</td><td class='small'>same run</td>"
         f"<td>This page generated at {_fmt_utc(now_utc)}.</td></tr>",
-        "<tr><td class='small'>5</td><td>rsync deploy</td><td class='small'>daily</td>"
-        "<td class='small'>no backlog</td><td class='small'>immediately after step 4</td>"
-        "<td>Deploy target: configured in config.py (DEPLOY_HOST/DEPLOY_PATH).</td></tr>",
+        _RECURRING_ROW_DEPLOY,
     ]
 
     cadence_text = "once per day" if runs_per_day == 1 else f"{runs_per_day} times per day"
+    cadence_html = escape(cadence_text)
 
-    body = f"""
-    <header>
-      <h1><a href="../index.html">{escape(site_title)}</a></h1>
-      <div class="meta"><span class="pill">Progress</span> <span class="pill">cron cadence: {escape(cadence_text)}</span></div>
-    </header>
-    <div class="controls">
-      <a class="btn" href="../index.html">← Index</a>
-      <a class="btn" href="index.html">Analysis</a>
-      <a class="btn" href="coverage.html">Coverage</a>
-    </div>
-    <div class="row">
-      <div class="summary">{overall_eta_html}</div>
-    </div>
-    <h2>Backlog Tasks (ETA)</h2>
-    <div class="table-wrap">
-      <table class="tbl">
-        <thead>
-          <tr>
-            <th>Step</th><th>Task</th><th>Done/Total</th><th>Remaining</th><th>Capacity</th><th>Runs left</th><th>Days left</th><th>ETA (UTC)</th><th>Last success</th><th>Notes</th>
-          </tr>
-        </thead>
-        <tbody>{"".join(backlog_rows)}</tbody>
-      </table>
-    </div>
-    <h2>Recurring Daily Tasks</h2>
-    <div class="table-wrap">
-      <table class="tbl">
-        <thead>
-          <tr><th>Step</th><th>Task</th><th>Schedule</th><th>Backlog</th><th>ETA</th><th>Notes</th></tr>
-        </thead>
-        <tbody>{"".join(recurring_rows)}</tbody>
-      </table>
-    </div>
-    <div class="row">
-      <div class="summary">Estimates assume fixed per-run limits and regular cron execution ({escape(cadence_text)}).</div>
-    </div>
-    """.strip()
+    body = _PROGRESS_BODY_TEMPLATE.format(
+        site_title=escape(site_title),
+        cadence=cadence_html,
+        overall_eta_html=overall_eta_html,
+        backlog_rows="".join(backlog_rows),
+        recurring_rows="".join(recurring_rows),
+    ).strip()
 
     return render_shell(title=f"{site_title} — Progress", body_html=body)
 
 
-def _render_analysis_index(*, site_title: str, summary_html: str) -> str:
-    body = f"""
+_ANALYSIS_INDEX_BODY_TEMPLATE = """
     <header>
-      <h1><a href="../index.html">{escape(site_title)}</a></h1>
+      <h1><a href="../index.html">{site_title}</a></h1>
       <div class="meta"><span class="pill">Analysis</span></div>
     </header>
     <div class="controls">
@@ -1244,10 +1478,37 @@ def _render_analysis_index(*, site_title: str, summary_html: str) -> str:
       <a class="btn" href="reuse_predictors_ngrams_2_3.html">TF‑IDF + LogReg (2–3 grams)</a>
     </div>
     {summary_html}
-    """.strip()
+    """
+
+
+def _render_analysis_index(*, site_title: str, summary_html: str) -> str:
+    body = _ANALYSIS_INDEX_BODY_TEMPLATE.format(
+        site_title=escape(site_title),
+        summary_html=summary_html,
+    ).strip()
     return render_shell(title=f"{site_title} — Analysis", body_html=body)
 
 
+_PREDICTORS_BODY_TEMPLATE = """
+    <header>
+      <h1><a href="../index.html">{site_title}</a></h1>
+      <div class="meta">{meta_html}</div>
+    </header>
+    <div class="controls">
+      <a class="btn" href="../index.html">← Index</a>
+      <a class="btn" href="index.html">Analysis</a>
+    </div>
+    <div class="row">
+      <div class="ref">{title_suffix}</div>
+      <div class="summary">{subtitle}</div>
+    </div>
+    <div class="grid">
+      {positive_table}
+      {negative_table}
+    </div>
+    """
+
+
 def _render_predictors_page(
     *,
     site_title: str,
@@ -1260,42 +1521,52 @@ def _render_predictors_page(
     meta_html = " ".join(f'<span class="pill">{escape(m)}</span>' for m in meta)
 
     def _table(rows: list[tuple[str, float]], heading: str) -> str:
-        tr = []
-        for i, (term, coef) in enumerate(rows, start=1):
-            tr.append(
-                f"<tr><td class='small'>{i}</td><td>{escape(term)}</td><td class='small'>{coef:+.4f}</td></tr>"
-            )
+        esc = escape
+        tbody = "".join(
+            [
+                f"<tr><td class='small'>{i}</td><td>{esc(term)}</td><td class='small'>{coef:+.4f}</td></tr>"
+                for i, (term, coef) in enumerate(rows, start=1)
+            ]
+        )
         return f"""
         <div class="table-wrap">
           <table class="tbl">
             <thead><tr><th colspan="3">{escape(heading)}</th></tr><tr><th>#</th><th>Term</th><th>Coef</th></tr></thead>
-            <tbody>{''.join(tr)}</tbody>
+            <tbody>{tbody}</tbody>
           </table>
         </div>
         """.strip()
 
-    body = f"""
-    <header>
-      <h1><a href="../index.html">{escape(site_title)}</a></h1>
-      <div class="meta">{meta_html}</div>
-    </header>
-    <div class="controls">
-      <a class="btn" href="../index.html">← Index</a>
-      <a class="btn" href="index.html">Analysis</a>
-    </div>
-    <div class="row">
-      <div class="ref">{escape(title_suffix)}</div>
-      <div class="summary">{escape(subtitle)}</div>
-    </div>
-    <div class="grid">
-      {_table(positive, 'Top re‑use predictors')}
-      {_table(negative, 'Top no‑re‑use predictors')}
-    </div>
-    """.strip()
+    body = _PREDICTORS_BODY_TEMPLATE.format(
+        site_title=escape(site_title),
+        meta_html=meta_html,
+        title_suffix=escape(title_suffix),
+        subtitle=escape(subtitle),
+        positive_table=_table(positive, 'Top re‑use predictors'),
+        negative_table=_table(negative, 'Top no‑re‑use predictors'),
+    ).strip()
 
     return render_shell(title=f"{site_title} — {title_suffix}", body_html=body)
 
 
+# Span lists at least this long are merged with NumPy; below it the array setup costs more
+# than the Python loop.
+MERGE_SPANS_NUMPY_MIN = 64
+
+
+def _merge_span_arrays(starts: np.ndarray, ends: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Merge spans given as parallel start/end arrays like _merge_spans: sort by start, then a new
+    span begins wherever a start lies past every earlier end (touching spans merge).
+    """
+    order = np.argsort(starts, kind="stable")
+    starts = starts[order]
+    ends = ends[order]
+    reach = np.maximum.accumulate(ends)
+    group_first = np.flatnonzero(np.concatenate(([True], starts[1:] > reach[:-1])))
+    return starts[group_first], np.maximum.reduceat(ends, group_first)
+
+
 def _merge_spans(spans: list[tuple[int, int]], *, clip_end: int | None = None) -> list[tuple[int, int]]:
     cleaned: list[tuple[int, int]] = []
     for start_i, end_i in spans:
@@ -1313,6 +1584,10 @@ def _merge_spans(spans: list[tuple[int, int]], *, clip_end: int | None = None) -
 
     if not cleaned:
         return []
+    if len(cleaned) >= MERGE_SPANS_NUMPY_MIN:
+        arr = np.array(cleaned, dtype=np.int64)
+        merged_starts, merged_ends = _merge_span_arrays(arr[:, 0], arr[:, 1])
+        return list(zip(merged_starts.tolist(), merged_ends.tolist()))
 
     cleaned.sort()
     merged = [cleaned[0]]
@@ -1325,8 +1600,72 @@ def _merge_spans(spans: list[tuple[int, int]], *, clip_end: int | None = None) -
     return merged
 
 
+def _covered_lengths_by_group(
+    group_idx: np.ndarray, starts: np.ndarray, ends: np.ndarray, *, group_lens: np.ndarray
+) -> np.ndarray:
+    """
+    Per group (e.g. passage), the number of positions covered by its spans after clipping to
+    [0, group_lens[g]] and merging, as _merge_spans + _spans_total_len would count them.
+
+    Each group is shifted into its own stretch of one shared axis, with a one-position gap
+    between groups, so a single merge pass never joins spans from different groups.
+    """
+    covered = np.zeros(len(group_lens), dtype=np.int64)
+    clip = group_lens[group_idx]
+    starts = np.clip(starts, 0, clip)
+    ends = np.clip(ends, 0, clip)
+    keep = ends > starts
+    if not keep.any():
+        return covered
+    offsets = np.concatenate(([0], np.cumsum(group_lens + 1)[:-1]))
+    shift = offsets[group_idx[keep]]
+    merged_starts, merged_ends = _merge_span_arrays(starts[keep] + shift, ends[keep] + shift)
+    owner = np.searchsorted(offsets, merged_starts, side="right") - 1
+    np.add.at(covered, owner, merged_ends - merged_starts)
+    return covered
+
+
 def _spans_total_len(spans: list[tuple[int, int]]) -> int:
-    return int(sum(e - s for (s, e) in spans))
+    if len(spans) < MERGE_SPANS_NUMPY_MIN:
+        return int(sum(e - s for (s, e) in spans))
+    arr = np.array(spans, dtype=np.int64)
+    return int((arr[:, 1] - arr[:, 0]).sum())
+
+
+_COVERAGE_BODY_TEMPLATE = """
+    <header>
+      <h1><a href="../index.html">{site_title}</a></h1>
+      <div class="meta"><span class="pill">Coverage</span> <span class="pill">{threshold_desc}</span></div>
+    </header>
+    <div class="controls">
+      <a class="btn" href="../index.html">← Index</a>
+      <a class="btn" href="index.html">Analysis</a>
+    </div>
+    <div class="grid">
+      {her_table}
+      {ste_table}
+    </div>
+    <div class="row">
+      <div class="summary">
+        Notes: coverage is computed using the union of stored overlap spans (0‑based, end‑exclusive) for matches meeting the threshold.
+        Because we keep only the top overlaps per passage and look for one longest contiguous block per pair, these numbers are conservative / lower‑bound estimates.
+      </div>
+    </div>
+    <h2>Most‑covered Herodian passages</h2>
+    <div class="table-wrap">
+      <table class="tbl">
+        <thead><tr><th>Ref</th><th>Coverage</th><th>Covered</th><th>Total</th></tr></thead>
+        <tbody>{top_herodian_rows}</tbody>
+      </table>
+    </div>
+    <h2>Most‑covered Stephanos lemmas</h2>
+    <div class="table-wrap">
+      <table class="tbl">
+        <thead><tr><th>Lemma</th><th>Coverage</th><th>Covered</th><th>Total</th></tr></thead>
+        <tbody>{top_stephanos_rows}</tbody>
+      </table>
+    </div>
+    """
 
 
 def _render_coverage_page(
@@ -1356,17 +1695,20 @@ def _render_coverage_page(
         return f"{int(n):,}"
 
     def table_rows(items: list[dict], columns: list[tuple[str, str]]) -> str:
-        out = []
-        for it in items:
-            tds = []
-            for key, _label in columns:
-                val = it.get(key, "")
-                if key.endswith("_html"):
-                    tds.append(f"<td>{val}</td>")
-                else:
-                    tds.append(f"<td>{escape(str(val))}</td>")
-            out.append("<tr>" + "".join(tds) + "</tr>")
-        return "".join(out)
+        # Each column's cell formatter is picked once (columns ending in _html already hold
+        # HTML), so rows just apply them.
+        esc = escape
+
+        def html_cell(val) -> str:
+            return f"<td>{val}</td>"
+
+        def text_cell(val) -> str:
+            return f"<td>{esc(str(val))}</td>"
+
+        cell_formatters = [(key, html_cell if key.endswith("_html") else text_cell) for key, _label in columns]
+        return "".join(
+            ["<tr>" + "".join([fmt(it.get(key, "")) for key, fmt in cell_formatters]) + "</tr>" for it in items]
+        )
 
     her_pct = pct(herodian_covered_chars, herodian_total_chars)
     ste_pct = pct(stephanos_covered_chars, stephanos_total_chars)
@@ -1427,161 +1769,101 @@ def _render_coverage_page(
         ],
     )
 
-    body = f"""
-    <header>
-      <h1><a href="../index.html">{escape(site_title)}</a></h1>
-      <div class="meta"><span class="pill">Coverage</span> <span class="pill">{escape(threshold_desc)}</span></div>
-    </header>
-    <div class="controls">
-      <a class="btn" href="../index.html">← Index</a>
-      <a class="btn" href="index.html">Analysis</a>
-    </div>
-    <div class="grid">
-      {her_table}
-      {ste_table}
-    </div>
-    <div class="row">
-      <div class="summary">
-        Notes: coverage is computed using the union of stored overlap spans (0‑based, end‑exclusive) for matches meeting the threshold.
-        Because we keep only the top overlaps per passage and look for one longest contiguous block per pair, these numbers are conservative / lower‑bound estimates.
-      </div>
-    </div>
-    <h2>Most‑covered Herodian passages</h2>
-    <div class="table-wrap">
-      <table class="tbl">
-        <thead><tr><th>Ref</th><th>Coverage</th><th>Covered</th><th>Total</th></tr></thead>
-        <tbody>{top_herodian_rows}</tbody>
-      </table>
-    </div>
-    <h2>Most‑covered Stephanos lemmas</h2>
-    <div class="table-wrap">
-      <table class="tbl">
-        <thead><tr><th>Lemma</th><th>Coverage</th><th>Covered</th><th>Total</th></tr></thead>
-        <tbody>{top_stephanos_rows}</tbody>
-      </table>
-    </div>
-    """.strip()
+    body = _COVERAGE_BODY_TEMPLATE.format(
+        site_title=escape(site_title),
+        threshold_desc=escape(threshold_desc),
+        her_table=her_table,
+        ste_table=ste_table,
+        top_herodian_rows=top_herodian_rows,
+        top_stephanos_rows=top_stephanos_rows,
+    ).strip()
     return render_shell(title=f"{site_title} — Coverage", body_html=body)
 
 
-def _generate_analysis_pages(
-    *,
-    out_dir: Path,
-    site_title: str,
-    lines: list[dict],
-    overlaps_by_line: dict[int, list[dict]],
-    latest_run_id: int | None,
-    progress_data: dict | None,
-    reuse_char_lcs_min: int,
-    reuse_word_lcs_min: int,
-    top_k: int = 50,
-) -> None:
-    analysis_dir = out_dir / "analysis"
-    analysis_dir.mkdir(parents=True, exist_ok=True)
+# (ngram_range, filename, label) for each TF‑IDF predictors page.
+_PREDICTOR_MODELS: tuple[tuple[tuple[int, int], str, str], ...] = (
+    ((1, 1), "reuse_predictors_words.html", "TF‑IDF + LogReg (words)"),
+    ((2, 3), "reuse_predictors_ngrams_2_3.html", "TF‑IDF + LogReg (word 2–3 grams)"),
+)
 
-    if progress_data is not None:
-        (analysis_dir / "progress.html").write_text(
-            _render_progress_page(site_title=site_title, progress_data=progress_data),
-            encoding="utf-8",
-        )
 
-    if not latest_run_id:
-        (analysis_dir / "index.html").write_text(
-            _render_analysis_index(
+@lru_cache(maxsize=1)
+def _sklearn_predictor_classes() -> tuple | None:
+    """
+    (TfidfVectorizer, LogisticRegression, normalize), or None when scikit-learn is not installed.
+    Imported on first use only, so site builds never pay for it until the analysis pages.
+    """
+    try:
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.preprocessing import normalize
+    except Exception:
+        return None
+    return TfidfVectorizer, LogisticRegression, normalize
+
+
+def _write_predictors_unavailable(analysis_dir: Path, *, site_title: str, threshold_desc: str) -> None:
+    for _ngram_range, filename, label in _PREDICTOR_MODELS:
+        write_site_file(
+            analysis_dir / filename,
+            _render_predictors_page(
                 site_title=site_title,
-                summary_html="<div class='row'><div class='summary'><span class='pending'>No overlap run found yet.</span></div></div>",
+                title_suffix=label,
+                subtitle=threshold_desc,
+                meta=["(unavailable)"],
+                positive=[],
+                negative=[],
             ),
-            encoding="utf-8",
         )
-        return
-
-    docs: list[str] = []
-    y: list[int] = []
-    significant_by_line: dict[int, list[dict]] = {}
-    for row in lines:
-        line_id = int(row["id"])
-        greek = row.get("greek_text") or ""
-        ovs = overlaps_by_line.get(line_id) or []
-        significant = [
-            ov
-            for ov in ovs
-            if (ov.get("char_lcs_len") or 0) >= reuse_char_lcs_min
-            and (ov.get("word_lcs_len") or 0) >= reuse_word_lcs_min
-        ]
-        if significant:
-            significant_by_line[line_id] = significant
-        reused = bool(significant)
-        docs.append(greek)
-        y.append(1 if reused else 0)
-
-    n_pos = sum(y)
-    n_total = len(y)
-    n_neg = n_total - n_pos
-
-    threshold_desc = f"reuse=1 if char≥{reuse_char_lcs_min} AND word≥{reuse_word_lcs_min} (run {latest_run_id})"
 
-    # Coverage analysis (no sklearn required)
-    herodian_total_chars = 0
-    herodian_covered_chars = 0
-    herodian_passages = 0
-    herodian_passages_reused = 0
-    herodian_rows_for_top: list[dict] = []
-
-    stephanos_spans_by_lemma: dict[int, list[tuple[int, int]]] = {}
-    stephanos_label_by_lemma: dict[int, str] = {}
 
-    for row in lines:
-        line_id = int(row["id"])
-        ref = str(row.get("ref") or "")
-        slug = ref_to_slug(ref)
-        text = row.get("greek_text") or ""
-        total_len = len(text)
-        herodian_passages += 1
-        herodian_total_chars += total_len
-
-        spans = []
-        for ov in significant_by_line.get(line_id, []):
-            s = _to_int(ov.get("herodian_char_start"))
-            e = _to_int(ov.get("herodian_char_end"))
-            if s is None or e is None:
-                continue
-            spans.append((s, e))
-
-            lemma_id = int(ov.get("stephanos_lemma_id") or 0)
-            if lemma_id:
-                ss = _to_int(ov.get("stephanos_char_start"))
-                ee = _to_int(ov.get("stephanos_char_end"))
-                if ss is not None and ee is not None:
-                    stephanos_spans_by_lemma.setdefault(lemma_id, []).append((ss, ee))
-                meineke_id = (ov.get("stephanos_meineke_id") or "").strip()
-                headword = (ov.get("stephanos_headword") or "").strip()
-                label = (f"{meineke_id} {headword}").strip() or f"lemma {lemma_id}"
-                stephanos_label_by_lemma.setdefault(lemma_id, label)
-
-        merged = _merge_spans(spans, clip_end=total_len)
-        covered = _spans_total_len(merged)
-        herodian_covered_chars += covered
-        if covered > 0:
-            herodian_passages_reused += 1
-
-        if total_len > 0:
-            ratio = covered / total_len
-        else:
-            ratio = 0.0
-        herodian_rows_for_top.append(
+def _coverage_stats(
+    *,
+    lines: list[dict],
+    text_lens_list: list[int],
+    span_line_idx: list[int],
+    span_starts: list[int],
+    span_ends: list[int],
+    stephanos_spans_by_lemma: dict[int, list[tuple[int, int]]],
+    stephanos_label_by_lemma: dict[int, str],
+) -> dict:
+    """
+    Coverage page figures (the _render_coverage_page keyword arguments other than site_title and
+    threshold_desc) from the significant overlaps' spans. Stephanos figures are None when its
+    database cannot be reached.
+    """
+    text_lens = np.array(text_lens_list, dtype=np.int64)
+    covered_by_line = _covered_lengths_by_group(
+        np.array(span_line_idx, dtype=np.int64),
+        np.array(span_starts, dtype=np.int64),
+        np.array(span_ends, dtype=np.int64),
+        group_lens=text_lens,
+    )
+    herodian_passages = len(lines)
+    herodian_total_chars = int(text_lens.sum())
+    herodian_covered_chars = int(covered_by_line.sum())
+    herodian_passages_reused = int(np.count_nonzero(covered_by_line))
+
+    ratio_by_line = covered_by_line / np.maximum(text_lens, 1)
+    coverage_keys = list(zip(ratio_by_line.tolist(), covered_by_line.tolist()))
+    # Only the 25 best-covered passages are shown, so only those get HTML rows (ties keep
+    # passage order, as a stable reverse sort would).
+    top_herodian = []
+    esc = escape
+    for line_idx in heapq.nlargest(25, range(len(lines)), key=coverage_keys.__getitem__):
+        ratio, covered = coverage_keys[line_idx]
+        total_len = int(text_lens[line_idx])
+        ref = str(lines[line_idx].get("ref") or "")
+        top_herodian.append(
             {
-                "ref_html": f'<a href="../passages/{escape(slug)}.html">{escape(ref)}</a>',
+                # safe: slug (see ref_to_slug)
+                "ref_html": f'<a href="../passages/{ref_to_slug(ref)}.html">{esc(ref)}</a>',
                 "coverage_pct": f"{ratio*100.0:.2f}%",
                 "covered_chars": f"{covered:,}",
                 "total_chars": f"{total_len:,}",
-                "_ratio": ratio,
-                "_covered": covered,
             }
         )
 
-    herodian_rows_for_top.sort(key=lambda d: (d.get("_ratio", 0.0), d.get("_covered", 0)), reverse=True)
-    top_herodian = herodian_rows_for_top[:25]
-
     stephanos_total_chars = None
     stephanos_covered_chars = None
     stephanos_lemmas = None
@@ -1594,64 +1876,131 @@ def _generate_analysis_pages(
         if lemma_ids:
             sconn = get_stephanos_connection(dict_cursor=True)
             try:
-                with sconn.cursor() as cur:
-                    cur.execute(
-                        """
-                        SELECT
-                          COUNT(*) AS lemmas,
-                          COALESCE(SUM(LENGTH(text_body)), 0) AS total_chars
-                        FROM lemma_source_text_versions
-                        WHERE source_document = 'meineke'
-                          AND is_current = TRUE
-                          AND text_body IS NOT NULL
-                        """
-                    )
-                    row = cur.fetchone()
-                    stephanos_lemmas = int(row["lemmas"] or 0)
-                    stephanos_total_chars = int(row["total_chars"] or 0)
-
-                    cur.execute(
-                        """
-                        SELECT lemma_id, LENGTH(text_body) AS n_chars
-                        FROM lemma_source_text_versions
-                        WHERE source_document = 'meineke'
-                          AND is_current = TRUE
-                          AND text_body IS NOT NULL
-                          AND lemma_id = ANY(%s)
-                        """,
-                        (lemma_ids,),
-                    )
-                    lengths = {int(r["lemma_id"]): int(r["n_chars"] or 0) for r in cur.fetchall()}
+                # range_agg/multirange unnest need PostgreSQL 14; older servers merge in Python.
+                merge_on_server = int(getattr(sconn, "server_version", 0) or 0) >= 140000
+                # Server-side cursor: the per-lemma rows are streamed into the dicts below in
+                # batches rather than fetched into one list first.
+                with sconn.cursor(name="stephanos_coverage_lengths") as cur:
+                    cur.itersize = STEPHANOS_LENGTHS_ITERSIZE
+                    # Corpus totals and the reused lemmas' lengths from one query: the row with
+                    # a NULL lemma_id carries the totals, the rest one length per lemma.
+                    if merge_on_server:
+                        # Ship the spans as parallel arrays and let range_agg clip, merge and
+                        # measure them next to the lengths they are clipped against.
+                        span_lemmas: list[int] = []
+                        span_starts_s: list[int] = []
+                        span_ends_s: list[int] = []
+                        for lemma_id in lemma_ids:
+                            for ss, ee in stephanos_spans_by_lemma[lemma_id]:
+                                span_lemmas.append(lemma_id)
+                                span_starts_s.append(ss)
+                                span_ends_s.append(ee)
+                        cur.execute(
+                            """
+                            WITH src AS (
+                              SELECT lemma_id, LENGTH(text_body) AS n_chars
+                              FROM lemma_source_text_versions
+                              WHERE source_document = 'meineke'
+                                AND is_current = TRUE
+                                AND text_body IS NOT NULL
+                            ),
+                            spans AS (
+                              SELECT sp.lemma_id,
+                                     CASE WHEN src.n_chars IS NULL THEN sp.s
+                                          ELSE GREATEST(0, LEAST(sp.s, src.n_chars)) END AS s,
+                                     CASE WHEN src.n_chars IS NULL THEN sp.e
+                                          ELSE GREATEST(0, LEAST(sp.e, src.n_chars)) END AS e
+                              FROM unnest(%s::bigint[], %s::bigint[], %s::bigint[]) AS sp(lemma_id, s, e)
+                              LEFT JOIN src ON src.lemma_id = sp.lemma_id
+                            ),
+                            merged AS (
+                              SELECT lemma_id, unnest(range_agg(int8range(s, e, '[)'))) AS r
+                              FROM spans
+                              WHERE s >= 0 AND e > s
+                              GROUP BY lemma_id
+                            ),
+                            covered AS (
+                              SELECT lemma_id, SUM(upper(r) - lower(r)) AS covered
+                              FROM merged
+                              GROUP BY lemma_id
+                            )
+                            SELECT NULL::bigint AS lemma_id, COUNT(*) AS lemmas, COALESCE(SUM(n_chars), 0) AS n_chars,
+                                   NULL::bigint AS covered
+                            FROM src
+                            UNION ALL
+                            SELECT l.lemma_id, NULL, src.n_chars, COALESCE(covered.covered, 0)
+                            FROM unnest(%s::bigint[]) AS l(lemma_id)
+                            LEFT JOIN src ON src.lemma_id = l.lemma_id
+                            LEFT JOIN covered ON covered.lemma_id = l.lemma_id
+                            """,
+                            (span_lemmas, span_starts_s, span_ends_s, lemma_ids),
+                        )
+                    else:
+                        cur.execute(
+                            """
+                            WITH src AS (
+                              SELECT lemma_id, LENGTH(text_body) AS n_chars
+                              FROM lemma_source_text_versions
+                              WHERE source_document = 'meineke'
+                                AND is_current = TRUE
+                                AND text_body IS NOT NULL
+                            )
+                            SELECT NULL::bigint AS lemma_id, COUNT(*) AS lemmas, COALESCE(SUM(n_chars), 0) AS n_chars
+                            FROM src
+                            UNION ALL
+                            SELECT lemma_id, NULL, n_chars
+                            FROM src
+                            WHERE lemma_id = ANY(%s::bigint[])
+                            """,
+                            (lemma_ids,),
+                        )
+                    lengths: dict[int, int] = {}
+                    covered_by_lemma: dict[int, int] = {}
+                    for r in cur:
+                        if r["lemma_id"] is None:
+                            stephanos_lemmas = int(r["lemmas"] or 0)
+                            stephanos_total_chars = int(r["n_chars"] or 0)
+                            continue
+                        lemma_id = int(r["lemma_id"])
+                        if r["n_chars"] is not None:
+                            lengths[lemma_id] = int(r["n_chars"])
+                        if merge_on_server:
+                            covered_by_lemma[lemma_id] = int(r["covered"] or 0)
+                if not merge_on_server:
+                    covered_by_lemma = {
+                        lemma_id: _spans_total_len(
+                            _merge_spans(stephanos_spans_by_lemma[lemma_id], clip_end=lengths.get(lemma_id))
+                        )
+                        for lemma_id in lemma_ids
+                    }
             finally:
                 sconn.close()
 
             stephanos_lemmas_reused = len(lemma_ids)
             stephanos_total_chars_reused_subset = sum(lengths.get(i, 0) for i in lemma_ids)
-            covered_sum = 0
-            rows = []
+            stephanos_covered_chars = sum(covered_by_lemma.get(i, 0) for i in lemma_ids)
+
+            def coverage_key(lemma_id: int) -> tuple[float, int]:
+                covered = covered_by_lemma.get(lemma_id, 0)
+                total_len = lengths.get(lemma_id) or 0
+                return ((covered / total_len) if total_len else 0.0, covered)
+
+            # As for Herodian, only the 25 best-covered lemmas get HTML rows.
             stephanos_base_url = _stephanos_base_url("https://stephanos.symmachus.org")
-            for lemma_id in lemma_ids:
-                spans = _merge_spans(stephanos_spans_by_lemma.get(lemma_id, []), clip_end=lengths.get(lemma_id))
-                covered = _spans_total_len(spans)
-                covered_sum += covered
+            esc = escape
+            for lemma_id in heapq.nlargest(25, lemma_ids, key=coverage_key):
+                ratio, covered = coverage_key(lemma_id)
                 total_len = lengths.get(lemma_id) or 0
-                ratio = (covered / total_len) if total_len else 0.0
                 label = stephanos_label_by_lemma.get(lemma_id) or f"lemma {lemma_id}"
                 url = stephanos_entry_url(base_url=stephanos_base_url, lemma_id=int(lemma_id))
-                rows.append(
+                top_stephanos.append(
                     {
-                        "label_html": f'<a href="{escape(url)}" target="_blank" rel="noopener">{escape(label)}</a>',
+                        "label_html": f'<a href="{esc(url)}" target="_blank" rel="noopener">{esc(label)}</a>',
                         "coverage_pct": f"{ratio*100.0:.2f}%",
                         "covered_chars": f"{covered:,}",
                         "total_chars": f"{total_len:,}",
-                        "_ratio": ratio,
-                        "_covered": covered,
                     }
                 )
-
-            stephanos_covered_chars = int(covered_sum)
-            rows.sort(key=lambda d: (d.get("_ratio", 0.0), d.get("_covered", 0)), reverse=True)
-            top_stephanos = rows[:25]
     except Exception:
         # Stephanos DB might not be reachable from some environments; keep Herodian-side stats.
         stephanos_total_chars = None
@@ -1661,24 +2010,181 @@ def _generate_analysis_pages(
         stephanos_total_chars_reused_subset = None
         top_stephanos = []
 
-    (analysis_dir / "coverage.html").write_text(
-        _render_coverage_page(
-            site_title=site_title,
-            threshold_desc=threshold_desc,
-            herodian_total_chars=int(herodian_total_chars),
-            herodian_covered_chars=int(herodian_covered_chars),
-            herodian_passages=int(herodian_passages),
-            herodian_passages_reused=int(herodian_passages_reused),
-            top_herodian=top_herodian,
-            stephanos_total_chars=stephanos_total_chars,
-            stephanos_covered_chars=stephanos_covered_chars,
-            stephanos_lemmas=stephanos_lemmas,
-            stephanos_lemmas_reused=stephanos_lemmas_reused,
-            stephanos_total_chars_reused_subset=stephanos_total_chars_reused_subset,
-            top_stephanos=top_stephanos,
-        ),
+    return {
+        "herodian_total_chars": herodian_total_chars,
+        "herodian_covered_chars": herodian_covered_chars,
+        "herodian_passages": herodian_passages,
+        "herodian_passages_reused": herodian_passages_reused,
+        "top_herodian": top_herodian,
+        "stephanos_total_chars": stephanos_total_chars,
+        "stephanos_covered_chars": stephanos_covered_chars,
+        "stephanos_lemmas": stephanos_lemmas,
+        "stephanos_lemmas_reused": stephanos_lemmas_reused,
+        "stephanos_total_chars_reused_subset": stephanos_total_chars_reused_subset,
+        "top_stephanos": top_stephanos,
+    }
+
+
+# Digest sidecar older builds kept next to analysis/coverage.html; removed when found.
+LEGACY_COVERAGE_HASH_NAME = ".coverage.hash"
+# The per-build footer stamp, blanked when comparing a page against the copy on disk.
+_FOOTER_GENERATED_RE = re.compile(r'<span class="meta"> · Generated: [^<]*</span>')
+
+
+def _same_apart_from_footer_stamp(path: Path, text: str) -> bool:
+    try:
+        existing = path.read_text(encoding="utf-8")
+    except (OSError, ValueError):
+        return False
+    return _FOOTER_GENERATED_RE.sub("", existing) == _FOOTER_GENERATED_RE.sub("", text)
+
+
+# Overlap matches of the latest finished run, kept in the render cache directory. Rows of a
+# finished run are never rewritten, so the run id (and the column list) is the whole key.
+OVERLAPS_CACHE_NAME = "overlaps.json"
+
+
+def _overlaps_cache_key(run_id: int) -> str:
+    return f"{run_id}:{','.join(OVERLAP_COLUMNS)}"
+
+
+def _load_overlap_rows(cache_dir: Path, run_id: int) -> list | None:
+    try:
+        cached = json.loads((cache_dir / OVERLAPS_CACHE_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, dict) or cached.get("key") != _overlaps_cache_key(run_id):
+        return None
+    return cached.get("rows")
+
+
+def _save_overlap_rows(cache_dir: Path, run_id: int, rows: list) -> None:
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_dir / f".{OVERLAPS_CACHE_NAME}.{os.getpid()}"
+    tmp_path.write_text(
+        json.dumps({"key": _overlaps_cache_key(run_id), "rows": rows}, ensure_ascii=False),
         encoding="utf-8",
     )
+    os.replace(tmp_path, cache_dir / OVERLAPS_CACHE_NAME)
+
+
+def _generate_analysis_pages(
+    *,
+    out_dir: Path,
+    site_title: str,
+    lines: list[dict],
+    overlaps_by_line: dict[int, list[dict]],
+    latest_run_id: int | None,
+    progress_data: dict | None,
+    reuse_char_lcs_min: int,
+    reuse_word_lcs_min: int,
+    top_k: int = 50,
+) -> None:
+    analysis_dir = out_dir / "analysis"
+    analysis_dir.mkdir(parents=True, exist_ok=True)
+
+    if progress_data is not None:
+        write_site_file(
+            analysis_dir / "progress.html",
+            _render_progress_page(site_title=site_title, progress_data=progress_data),
+        )
+
+    if not latest_run_id:
+        write_site_file(
+            analysis_dir / "index.html",
+            _render_analysis_index(
+                site_title=site_title,
+                summary_html="<div class='row'><div class='summary'><span class='pending'>No overlap run found yet.</span></div></div>",
+            ),
+        )
+        return
+
+    # One pass over the passages builds the predictor dataset (docs/y) and gathers the coverage
+    # spans. Herodian spans are kept as flat (passage index, start, end) columns and measured
+    # for all passages at once by _covered_lengths_by_group.
+    docs: list[str] = []
+    y: list[int] = []
+    text_lens_list: list[int] = []
+    span_line_idx: list[int] = []
+    span_starts: list[int] = []
+    span_ends: list[int] = []
+    stephanos_spans_by_lemma: dict[int, list[tuple[int, int]]] = {}
+    stephanos_label_by_lemma: dict[int, str] = {}
+    # Hot-loop names bound to locals, as in render_index.
+    get_overlaps = overlaps_by_line.get
+    docs_append = docs.append
+    y_append = y.append
+    text_len_append = text_lens_list.append
+    span_line_append = span_line_idx.append
+    span_start_append = span_starts.append
+    span_end_append = span_ends.append
+    for line_idx, row in enumerate(lines):
+        greek = row.get("greek_text") or ""
+        docs_append(greek)
+        text_len_append(len(greek))
+        significant = [
+            ov
+            for ov in get_overlaps(int(row["id"])) or ()
+            if (ov.get("char_lcs_len") or 0) >= reuse_char_lcs_min
+            and (ov.get("word_lcs_len") or 0) >= reuse_word_lcs_min
+        ]
+        y_append(1 if significant else 0)
+
+        for ov in significant:
+            # Offsets inlined rather than via _to_int: this runs once per significant overlap.
+            try:
+                s = int(ov.get("herodian_char_start"))
+                e = int(ov.get("herodian_char_end"))
+            except (TypeError, ValueError, OverflowError):
+                continue
+            span_line_append(line_idx)
+            span_start_append(s)
+            span_end_append(e)
+
+            lemma_id = int(ov.get("stephanos_lemma_id") or 0)
+            if lemma_id:
+                try:
+                    stephanos_span = (int(ov.get("stephanos_char_start")), int(ov.get("stephanos_char_end")))
+                except (TypeError, ValueError, OverflowError):
+                    pass
+                else:
+                    stephanos_spans_by_lemma.setdefault(lemma_id, []).append(stephanos_span)
+                meineke_id = (ov.get("stephanos_meineke_id") or "").strip()
+                headword = (ov.get("stephanos_headword") or "").strip()
+                label = (f"{meineke_id} {headword}").strip() or f"lemma {lemma_id}"
+                stephanos_label_by_lemma.setdefault(lemma_id, label)
+
+    n_pos = sum(y)
+    n_total = len(y)
+    n_neg = n_total - n_pos
+
+    threshold_desc = f"reuse=1 if char≥{reuse_char_lcs_min} AND word≥{reuse_word_lcs_min} (run {latest_run_id})"
+
+    coverage_stats = _coverage_stats(
+        lines=lines,
+        text_lens_list=text_lens_list,
+        span_line_idx=span_line_idx,
+        span_starts=span_starts,
+        span_ends=span_ends,
+        stephanos_spans_by_lemma=stephanos_spans_by_lemma,
+        stephanos_label_by_lemma=stephanos_label_by_lemma,
+    )
+
+    # The page is only rewritten when it differs from the copy on disk by more than the
+    # footer's build stamp, so unchanged figures keep their file (and mtime for rsync).
+    coverage_path = analysis_dir / "coverage.html"
+    coverage_html = _render_coverage_page(site_title=site_title, threshold_desc=threshold_desc, **coverage_stats)
+    if not _same_apart_from_footer_stamp(coverage_path, coverage_html):
+        write_site_file(coverage_path, coverage_html)
+    (analysis_dir / LEGACY_COVERAGE_HASH_NAME).unlink(missing_ok=True)
+
+    herodian_total_chars = coverage_stats["herodian_total_chars"]
+    herodian_covered_chars = coverage_stats["herodian_covered_chars"]
+    herodian_passages = coverage_stats["herodian_passages"]
+    herodian_passages_reused = coverage_stats["herodian_passages_reused"]
+    stephanos_total_chars = coverage_stats["stephanos_total_chars"]
+    stephanos_covered_chars = coverage_stats["stephanos_covered_chars"]
+    stephanos_total_chars_reused_subset = coverage_stats["stephanos_total_chars_reused_subset"]
 
     her_pct_str = (
         f"{(herodian_covered_chars / herodian_total_chars * 100.0):.2f}%"
@@ -1706,98 +2212,84 @@ def _generate_analysis_pages(
         "</div>"
     )
 
-    predictors_status = ""
-    try:
-        from sklearn.feature_extraction.text import TfidfVectorizer
-        from sklearn.linear_model import LogisticRegression
-        from sklearn.pipeline import Pipeline
-    except Exception:
+    sklearn_classes = _sklearn_predictor_classes()
+    if sklearn_classes is None:
         predictors_status = "<div class='row'><div class='summary'><span class='pending'>Install scikit-learn to generate TF‑IDF predictors.</span></div></div>"
-        (analysis_dir / "reuse_predictors_words.html").write_text(
-            _render_predictors_page(
-                site_title=site_title,
-                title_suffix="TF‑IDF + LogReg (words)",
-                subtitle=threshold_desc,
-                meta=["(unavailable)"],
-                positive=[],
-                negative=[],
-            ),
-            encoding="utf-8",
-        )
-        (analysis_dir / "reuse_predictors_ngrams_2_3.html").write_text(
-            _render_predictors_page(
-                site_title=site_title,
-                title_suffix="TF‑IDF + LogReg (word 2–3 grams)",
-                subtitle=threshold_desc,
-                meta=["(unavailable)"],
-                positive=[],
-                negative=[],
-            ),
-            encoding="utf-8",
-        )
-        (analysis_dir / "index.html").write_text(
-            _render_analysis_index(
-                site_title=site_title,
-                summary_html=(
-                    "<div class='row'>"
-                    f"<div class='summary'>Dataset: <code>{escape(threshold_desc)}</code> — {n_pos} reuse / {n_neg} no‑reuse.</div>"
-                    "</div>"
-                    + coverage_summary_html
-                    + predictors_status
-                ),
-            ),
-            encoding="utf-8",
-        )
-        return
+        _write_predictors_unavailable(analysis_dir, site_title=site_title, threshold_desc=threshold_desc)
+    else:
+        predictors_status = ""
+        TfidfVectorizer, LogisticRegression, normalize = sklearn_classes
 
-    def run_model(*, ngram_range: tuple[int, int], filename: str, label: str) -> None:
+        # One vectorizer covers every model's n-gram range, so the corpus is tokenized and its
+        # document frequencies counted once. Rows are left unnormalised here and each model's
+        # column slice is L2-normalised on its own, which is what a vectorizer fitted on just
+        # that n-gram range would produce.
         vectorizer = TfidfVectorizer(
             preprocessor=_greek_casefold_strip,
             token_pattern=r"(?u)\b[^\W\d_]{2,}\b",
-            ngram_range=ngram_range,
+            ngram_range=(
+                min(ngram_range[0] for ngram_range, _filename, _label in _PREDICTOR_MODELS),
+                max(ngram_range[1] for ngram_range, _filename, _label in _PREDICTOR_MODELS),
+            ),
             min_df=2,
+            norm=None,
         )
-        clf = LogisticRegression(
-            C=1.0,
-            solver="liblinear",
-            max_iter=2000,
+        # Kept as CSR: column selection on CSR needs no format conversion, and its result is a
+        # fresh matrix that can be normalised in place.
+        tfidf = vectorizer.fit_transform(docs)
+        all_feature_names = vectorizer.get_feature_names_out()
+        # Tokens never contain spaces, so an n-gram's length is its space count plus one.
+        feature_ngram_lens = np.fromiter(
+            (name.count(" ") + 1 for name in all_feature_names), dtype=np.int64, count=len(all_feature_names)
         )
-        pipe = Pipeline([("tfidf", vectorizer), ("logreg", clf)])
-        pipe.fit(docs, y)
-
-        feature_names = pipe.named_steps["tfidf"].get_feature_names_out()
-        coefs = pipe.named_steps["logreg"].coef_[0]
-        pairs = list(zip(feature_names, coefs))
-        pairs.sort(key=lambda t: float(t[1]), reverse=True)
-        positive = [(t, float(c)) for (t, c) in pairs[:top_k]]
-        negative = [(t, float(c)) for (t, c) in pairs[-top_k:]][::-1]
 
-        (analysis_dir / filename).write_text(
-            _render_predictors_page(
-                site_title=site_title,
-                title_suffix=label,
-                subtitle=threshold_desc,
-                meta=[
-                    f"{n_total} docs",
-                    f"{n_pos} reuse",
-                    f"{n_neg} no‑reuse",
-                    f"ngram={ngram_range[0]}–{ngram_range[1]}",
-                    "logreg L2 (C=1.0)",
-                ],
-                positive=positive,
-                negative=negative,
-            ),
-            encoding="utf-8",
-        )
-
-    run_model(ngram_range=(1, 1), filename="reuse_predictors_words.html", label="TF‑IDF + LogReg (words)")
-    run_model(
-        ngram_range=(2, 3),
-        filename="reuse_predictors_ngrams_2_3.html",
-        label="TF‑IDF + LogReg (word 2–3 grams)",
-    )
+        def run_model(*, ngram_range: tuple[int, int], filename: str, label: str) -> None:
+            columns = np.flatnonzero(
+                (feature_ngram_lens >= ngram_range[0]) & (feature_ngram_lens <= ngram_range[1])
+            )
+            clf = LogisticRegression(
+                C=1.0,
+                solver="liblinear",
+                max_iter=2000,
+            )
+            clf.fit(normalize(tfidf[:, columns], copy=False), y)
+
+            feature_names = all_feature_names[columns]
+            coefs = clf.coef_[0]
+            pairs = list(zip(feature_names, coefs))
+            pairs.sort(key=lambda t: float(t[1]), reverse=True)
+            positive = [(t, float(c)) for (t, c) in pairs[:top_k]]
+            negative = [(t, float(c)) for (t, c) in pairs[-top_k:]][::-1]
+
+            write_site_file(
+                analysis_dir / filename,
+                _render_predictors_page(
+                    site_title=site_title,
+                    title_suffix=label,
+                    subtitle=threshold_desc,
+                    meta=[
+                        f"{n_total} docs",
+                        f"{n_pos} reuse",
+                        f"{n_neg} no‑reuse",
+                        f"ngram={ngram_range[0]}–{ngram_range[1]}",
+                        "logreg L2 (C=1.0)",
+                    ],
+                    positive=positive,
+                    negative=negative,
+                ),
+            )
 
-    (analysis_dir / "index.html").write_text(
+        # liblinear releases the GIL while training, so the models fit side by side in threads.
+        with ThreadPoolExecutor(max_workers=len(_PREDICTOR_MODELS)) as model_pool:
+            model_runs = [
+                model_pool.submit(run_model, ngram_range=ngram_range, filename=filename, label=label)
+                for ngram_range, filename, label in _PREDICTOR_MODELS
+            ]
+            for fut in model_runs:
+                fut.result()  # re-raise any fitting error
+
+    write_site_file(
+        analysis_dir / "index.html",
         _render_analysis_index(
             site_title=site_title,
             summary_html=(
@@ -1805,34 +2297,235 @@ def _generate_analysis_pages(
                 f"<div class='summary'>Dataset: <code>{escape(threshold_desc)}</code> — {n_pos} reuse / {n_neg} no‑reuse.</div>"
                 "</div>"
                 + coverage_summary_html
+                + predictors_status
             ),
         ),
-        encoding="utf-8",
     )
 
 
+# Read-only passage rendering inputs for worker processes, set once per process by
+# _init_passage_worker.
+_PASSAGE_CONTEXT: dict = {}
+
+
+def _init_passage_worker(context: dict) -> None:
+    _BUILD_INFO.update(context["build_info"])
+    cache_dir = context["render_cache_dir"]
+    _PASSAGE_CONTEXT.clear()
+    _PASSAGE_CONTEXT.update(
+        site_title=context["site_title"],
+        stephanos_text_by_lemma_id=context["stephanos_text_by_lemma_id"],
+        render_cache=PassageRenderCache(cache_dir) if cache_dir is not None else None,
+    )
+
+
+def _render_passage_task(task: tuple[str, dict, list[dict]]) -> tuple[str, str, list[str]]:
+    slug, row, overlaps = task
+    render_cache = _PASSAGE_CONTEXT["render_cache"]
+    html = render_passage(
+        site_title=_PASSAGE_CONTEXT["site_title"],
+        ref=row["ref"],
+        summary=row.get("summary"),
+        greek_text=row.get("greek_text") or "",
+        english_translation=row.get("english_translation"),
+        gadget_html=row.get("gadget_html"),
+        gadget_css=row.get("gadget_css"),
+        gadget_js=row.get("gadget_js"),
+        overlaps=overlaps,
+        stephanos_text_by_lemma_id=_PASSAGE_CONTEXT["stephanos_text_by_lemma_id"],
+        render_cache=render_cache,
+    )
+    used_keys: list[str] = []
+    if render_cache is not None:
+        used_keys = list(render_cache.used)
+        render_cache.used.clear()
+    return slug, html, used_keys
+
+
+def render_passages(
+    tasks: list[tuple[str, dict, list[dict]]], *, context: dict, workers: int
+) -> Iterator[tuple[str, str, list[str]]]:
+    """
+    Yield (slug, html, render cache keys used) for each (slug, row, overlaps) task, in completion order.
+
+    With workers > 1 passages are rendered in a process pool; `context` (site title, Stephanos
+    texts, render cache directory, build info) is installed once per worker rather than sent
+    per task.
+    """
+    if workers <= 1:
+        _init_passage_worker(context)
+        for task in tasks:
+            yield _render_passage_task(task)
+        return
+    chunksize = max(1, len(tasks) // (4 * workers))
+    with multiprocessing.Pool(
+        processes=workers, initializer=_init_passage_worker, initargs=(context,)
+    ) as pool:
+        yield from pool.imap_unordered(_render_passage_task, tasks, chunksize=chunksize)
+
+
+# Item separator that lays out one flat row the way json.dumps(..., indent=2) does inside a list.
+_PASSAGE_JSON_ITEM_SEPARATOR = ",\n    "
+
+
+def _passages_json(lines: list[dict]) -> str:
+    """
+    json.dumps(lines, ensure_ascii=False, indent=2), byte for byte, using the C encoder.
+
+    The stdlib only uses its C encoder when indent is None, so the list is encoded in one call
+    with a newline-and-indent item separator and the row boundaries are re-laid afterwards.
+    Rows hold only scalars (see LINE_COLUMNS) and encoded strings never contain a raw newline,
+    so "}" + separator + "{" occurs exactly between two rows.
+    """
+    if not lines:
+        return "[]"
+    sep = _PASSAGE_JSON_ITEM_SEPARATOR
+    body = json.dumps(lines, ensure_ascii=False, separators=(sep, ": "))
+    body = body[2:-2].replace("}" + sep + "{", "\n  },\n  {\n    ")
+    return "[\n  {\n    " + body + "\n  }\n]"
+
+
+BUILD_STAMP_NAME = ".build-stamp"
+
+# Threads writing finished pages to disk while the main thread renders the next ones.
+SITE_WRITE_WORKERS = 4
+
+
+def compute_build_stamp(cur, *, args: argparse.Namespace) -> tuple[str, dict]:
+    """
+    Fingerprint everything the generated site depends on, so unchanged rebuilds can be skipped.
+
+    Covers every cathpros_lines row, the latest finished overlap run, the CLI options, this
+    script, the stylesheet and config.py, the source TSV, and the current UTC date (the progress page's
+    estimates are relative to "now", so pages are refreshed at least daily).
+
+    The progress page's whole-table aggregates (row count and latest timestamps) come from the
+    same scan of cathpros_lines and are returned alongside the stamp.
+    """
+    cur.execute(
+        """
+        SELECT
+          agg.lines_md5,
+          agg.total_all,
+          agg.latest_imported_at,
+          agg.latest_translated_at,
+          agg.latest_summarized_at,
+          agg.latest_gadget_generated_at,
+          (SELECT MAX(id) FROM stephanos_overlap_runs WHERE finished_at IS NOT NULL) AS latest_run_id
+        FROM (
+          SELECT
+            md5(string_agg(md5(l::text), '' ORDER BY l.id)) AS lines_md5,
+            COUNT(*) AS total_all,
+            MAX(l.imported_at) AS latest_imported_at,
+            MAX(l.translated_at) AS latest_translated_at,
+            MAX(l.summarized_at) AS latest_summarized_at,
+            MAX(l.gadget_generated_at) AS latest_gadget_generated_at
+          FROM cathpros_lines l
+        ) AS agg
+        """
+    )
+    row = cur.fetchone() or {}
+    digest = hashlib.sha1()
+    parts = [
+        str(row.get("lines_md5")),
+        str(row.get("latest_run_id")),
+        repr(
+            sorted(
+                (k, v)
+                for k, v in vars(args).items()
+                if k not in ("out", "force", "render_cache", "clean_cache", "workers")
+            )
+        ),
+        datetime.now(timezone.utc).date().isoformat(),
+    ]
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    for path in (Path(__file__), STYLE_CSS_PATH, Path("config.py")):
+        if path.exists():
+            digest.update(path.read_bytes())
+    source_tsv_path = Path("HerodianCathPros.txt")
+    if source_tsv_path.exists():
+        st = source_tsv_path.stat()
+        digest.update(f"{st.st_size}:{st.st_mtime_ns}".encode("ascii"))
+    return digest.hexdigest(), row
+
+
+def _count_lines(path: Path) -> int:
+    """
+    Number of lines as iterating the file in text mode would yield them (universal newlines:
+    \\n, \\r\\n or a lone \\r ends a line; a final unterminated line counts), counted with
+    bytes.count over the raw file instead of decoding and iterating it line by line.
+    """
+    data = path.read_bytes()
+    n = data.count(b"\n") + data.count(b"\r") - data.count(b"\r\n")
+    if data and data[-1:] not in (b"\n", b"\r"):
+        n += 1
+    return n
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Generate static site from cathpros_lines.")
     parser.add_argument("--out", default="site", help="Output directory (default: site)")
     parser.add_argument("--overlap-metric-version", default="v1", help="Overlap metric version to display (default: v1)")
     parser.add_argument("--reuse-char-lcs-min", type=int, default=80, help="Reuse label threshold: min char LCS length (default: 80)")
     parser.add_argument("--reuse-word-lcs-min", type=int, default=15, help="Reuse label threshold: min word LCS length (default: 15)")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if nothing changed since the last build")
+    parser.add_argument(
+        "--render-cache",
+        default=".render_cache",
+        help="Directory for cached passage renders and overlap matches (default: .render_cache; empty string disables)",
+    )
+    parser.add_argument("--clean-cache", action="store_true", help="Empty the render cache before building")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Passage rendering processes (default: CPU count; 1 = render in-process)",
+    )
     args = parser.parse_args()
 
+    if args.clean_cache and args.render_cache:
+        shutil.rmtree(args.render_cache, ignore_errors=True)
+
     out_dir = Path(args.out)
     out_dir.mkdir(parents=True, exist_ok=True)
     passages_dir = out_dir / "passages"
     passages_dir.mkdir(parents=True, exist_ok=True)
 
+    writer = ThreadPoolExecutor(max_workers=SITE_WRITE_WORKERS)
+    pending_writes: list[Future] = []
+
+    def write_in_background(path: Path, text: str, **kwargs) -> None:
+        pending_writes.append(writer.submit(write_site_file, path, text, **kwargs))
+
     conn = get_connection(dict_cursor=True)
+    lines: list[dict] = []
+    translatable_count = 0
+    translated_count = 0
+    summarized_count = 0
+    gadget_done_count = 0
+    gadget_ready_count = 0
     latest_run_id = None
-    overlap_rows = []
+    overlaps_by_line: dict[int, list[dict]] = {}
     progress_row = None
     latest_overlap_run_meta = None
     overlap_avg_duration_seconds = None
     try:
         with conn.cursor() as cur:
-            cur.execute(
+            build_stamp, progress_row = compute_build_stamp(cur, args=args)
+        stamp_path = out_dir / BUILD_STAMP_NAME
+        if not args.force and stamp_path.exists() and stamp_path.read_text(encoding="utf-8") == build_stamp:
+            print(f"OK: {out_dir} is up to date (no changes since the last build).")
+            return
+
+        # The stylesheet does not depend on the database; write it while the queries run.
+        write_in_background(out_dir / "style.css", _style_css_min() + "\n", precompress=True, skip_unchanged=True)
+
+        # Stream passages through a server-side cursor with plain tuple rows (no RealDictRow).
+        with conn.cursor(name="cathpros_lines_stream", cursor_factory=TupleCursor) as line_cur:
+            line_cur.itersize = LINES_ITERSIZE
+            line_cur.execute(
                 """
                 SELECT
                   id,
@@ -1845,45 +2538,30 @@ def main() -> None:
                   gadget_html,
                   gadget_css,
                   gadget_js,
-                  translated_at
+                  to_char(translated_at AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS.US"+00:00"') AS translated_at
                 FROM cathpros_lines
                 WHERE ref NOT IN ('E')
                 ORDER BY ref_major NULLS LAST, ref_minor NULLS LAST, ref
                 """
             )
-            rows = cur.fetchall()
-
-            cur.execute(
-                """
-                SELECT
-                  COUNT(*) FILTER (WHERE ref NOT IN ('E')) AS total,
-                  COUNT(*) FILTER (WHERE english_translation IS NOT NULL AND ref NOT IN ('E') AND COALESCE(ref_major, 1) <> 0) AS translated,
-                  COUNT(*) FILTER (WHERE summary IS NOT NULL AND ref NOT IN ('E')) AS summarized
-                FROM cathpros_lines
-                """
-            )
-            stats_row = cur.fetchone()
-
-            cur.execute(
-                """
-                SELECT
-                  COUNT(*) AS total_all,
-                  COUNT(*) FILTER (WHERE ref NOT IN ('E')) AS total_non_e,
-                  COUNT(*) FILTER (WHERE ref NOT IN ('E') AND COALESCE(ref_major, 1) <> 0) AS total_translatable,
-                  COUNT(*) FILTER (WHERE ref NOT IN ('E') AND COALESCE(ref_major, 1) <> 0 AND english_translation IS NOT NULL) AS translated_done,
-                  COUNT(*) FILTER (WHERE ref NOT IN ('E') AND summary IS NOT NULL) AS summarized_done,
-                  COUNT(*) FILTER (WHERE ref NOT IN ('E') AND COALESCE(ref_major, 1) <> 0 AND gadget_html IS NOT NULL) AS gadget_done,
-                  COUNT(*) FILTER (WHERE ref NOT IN ('E') AND COALESCE(ref_major, 1) <> 0 AND english_translation IS NOT NULL AND gadget_html IS NULL) AS gadget_ready_pending,
-                  COUNT(*) FILTER (WHERE ref NOT IN ('E') AND COALESCE(ref_major, 1) <> 0 AND english_translation IS NULL) AS gadget_blocked_translation,
-                  MAX(imported_at) AS latest_imported_at,
-                  MAX(translated_at) AS latest_translated_at,
-                  MAX(summarized_at) AS latest_summarized_at,
-                  MAX(gadget_generated_at) AS latest_gadget_generated_at
-                FROM cathpros_lines
-                """
-            )
-            progress_row = cur.fetchone()
+            # Headline and progress stats are counted during the same scan instead of
+            # FILTER aggregates in a second query (ref_major != 0 matches COALESCE(ref_major, 1) <> 0).
+            for values in line_cur:
+                r = dict(zip(LINE_COLUMNS, values))
+                r["id"] = int(r["id"])
+                lines.append(r)
+                if r["ref_major"] != 0:
+                    translatable_count += 1
+                    if r["english_translation"] is not None:
+                        translated_count += 1
+                        if r["gadget_html"] is None:
+                            gadget_ready_count += 1
+                    if r["gadget_html"] is not None:
+                        gadget_done_count += 1
+                if r["summary"] is not None:
+                    summarized_count += 1
 
+        with conn.cursor() as cur:
             cur.execute(
                 """
                 SELECT
@@ -1912,30 +2590,46 @@ def main() -> None:
                         else None
                     ),
                 }
-                cur.execute(
-                    """
-                    SELECT
-                      herodian_line_id,
-                      stephanos_lemma_id,
-                      stephanos_meineke_id,
-                      stephanos_headword,
-                      char_lcs_len,
-                      char_lcs_ratio,
-                      herodian_char_start,
-                      herodian_char_end,
-                      stephanos_char_start,
-                      stephanos_char_end,
-                      word_lcs_len,
-                      word_lcs_ratio,
-                      shared_char_shingles,
-                      shared_word_shingles
-                    FROM stephanos_overlap_matches
-                    WHERE run_id = %s
-                    ORDER BY herodian_line_id, char_lcs_ratio DESC, word_lcs_ratio DESC, char_lcs_len DESC
-                    """,
-                    (latest_run_id,),
+                # Tuple rows straight into per-line dicts: the columns are NOT NULL INTEGER/REAL
+                # (or nullable offsets and text), so psycopg2 already yields the right types,
+                # and they survive the JSON round-trip through the overlaps cache unchanged.
+                overlap_rows = (
+                    _load_overlap_rows(Path(args.render_cache), latest_run_id)
+                    if args.render_cache
+                    else None
                 )
-                overlap_rows = cur.fetchall()
+                if overlap_rows is None:
+                    with conn.cursor(name="overlap_matches_stream", cursor_factory=TupleCursor) as overlap_cur:
+                        overlap_cur.itersize = OVERLAPS_ITERSIZE
+                        overlap_cur.execute(
+                            """
+                            SELECT
+                              herodian_line_id,
+                              stephanos_lemma_id,
+                              stephanos_meineke_id,
+                              stephanos_headword,
+                              char_lcs_len,
+                              char_lcs_ratio,
+                              herodian_char_start,
+                              herodian_char_end,
+                              stephanos_char_start,
+                              stephanos_char_end,
+                              word_lcs_len,
+                              word_lcs_ratio
+                            FROM stephanos_overlap_matches
+                            WHERE run_id = %s
+                            ORDER BY herodian_line_id, char_lcs_len DESC, word_lcs_len DESC, char_lcs_ratio DESC, word_lcs_ratio DESC
+                            """,
+                            (latest_run_id,),
+                        )
+                        overlap_rows = list(overlap_cur)
+                    if args.render_cache:
+                        _save_overlap_rows(Path(args.render_cache), latest_run_id, overlap_rows)
+                # Rows arrive ordered by herodian_line_id, so each line's matches are one run.
+                overlaps_by_line = {
+                    line_id: [dict(zip(OVERLAP_COLUMNS, row[1:])) for row in line_rows]
+                    for line_id, line_rows in groupby(overlap_rows, key=itemgetter(0))
+                }
 
                 cur.execute(
                     """
@@ -1967,36 +2661,17 @@ def main() -> None:
     finally:
         conn.close()
 
-    lines = []
-    for r in rows:
-        lines.append(
-            {
-                "id": int(r["id"]),
-                "ref": r["ref"],
-                "ref_major": r.get("ref_major"),
-                "ref_minor": r.get("ref_minor"),
-                "greek_text": r["greek_text"],
-                "english_translation": r["english_translation"],
-                "summary": r.get("summary"),
-                "gadget_html": r.get("gadget_html"),
-                "gadget_css": r.get("gadget_css"),
-                "gadget_js": r.get("gadget_js"),
-                "translated_at": r["translated_at"],
-            }
-        )
-
     stats = {
-        "total": int(stats_row["total"] or 0),
-        "translated": int(stats_row["translated"] or 0),
-        "summarized": int(stats_row["summarized"] or 0),
+        "total": len(lines),
+        "translated": translated_count,
+        "summarized": summarized_count,
         "latest_overlap_run_id": latest_run_id,
     }
 
     source_tsv_path = Path("HerodianCathPros.txt")
     source_tsv_rows = None
     if source_tsv_path.exists():
-        with source_tsv_path.open("r", encoding="utf-8") as f:
-            source_tsv_rows = sum(1 for _ in f)
+        source_tsv_rows = _count_lines(source_tsv_path)
 
     runs_per_day = max(
         1, _env_or_config_int("PIPELINE_RUNS_PER_DAY", "PIPELINE_RUNS_PER_DAY", 1)
@@ -2014,17 +2689,13 @@ def main() -> None:
         "summary_limit": summary_limit,
         "gadget_limit": gadget_limit,
         "total_all": int((progress_row or {}).get("total_all") or 0),
-        "total_non_e": int((progress_row or {}).get("total_non_e") or 0),
-        "total_translatable": int((progress_row or {}).get("total_translatable") or 0),
-        "translated_done": int((progress_row or {}).get("translated_done") or 0),
-        "summarized_done": int((progress_row or {}).get("summarized_done") or 0),
-        "gadget_done": int((progress_row or {}).get("gadget_done") or 0),
-        "gadget_ready_pending": int(
-            (progress_row or {}).get("gadget_ready_pending") or 0
-        ),
-        "gadget_blocked_translation": int(
-            (progress_row or {}).get("gadget_blocked_translation") or 0
-        ),
+        "total_non_e": len(lines),
+        "total_translatable": translatable_count,
+        "translated_done": translated_count,
+        "summarized_done": summarized_count,
+        "gadget_done": gadget_done_count,
+        "gadget_ready_pending": gadget_ready_count,
+        "gadget_blocked_translation": translatable_count - translated_count,
         "latest_imported_at": (progress_row or {}).get("latest_imported_at"),
         "latest_translated_at": (progress_row or {}).get("latest_translated_at"),
         "latest_summarized_at": (progress_row or {}).get("latest_summarized_at"),
@@ -2052,41 +2723,9 @@ def main() -> None:
         "overlap_avg_duration_seconds": overlap_avg_duration_seconds,
     }
 
-    (out_dir / "style.css").write_text(STYLE_CSS.strip() + "\n", encoding="utf-8")
-
-    overlaps_by_line: dict[int, list[dict]] = {}
-    for ov in overlap_rows:
-        overlaps_by_line.setdefault(int(ov["herodian_line_id"]), []).append(
-            {
-                "stephanos_lemma_id": int(ov["stephanos_lemma_id"]),
-                "stephanos_meineke_id": ov.get("stephanos_meineke_id"),
-                "stephanos_headword": ov.get("stephanos_headword"),
-                "char_lcs_len": int(ov["char_lcs_len"]),
-                "char_lcs_ratio": float(ov["char_lcs_ratio"]),
-                "herodian_char_start": ov.get("herodian_char_start"),
-                "herodian_char_end": ov.get("herodian_char_end"),
-                "stephanos_char_start": ov.get("stephanos_char_start"),
-                "stephanos_char_end": ov.get("stephanos_char_end"),
-                "word_lcs_len": int(ov["word_lcs_len"]),
-                "word_lcs_ratio": float(ov["word_lcs_ratio"]),
-            }
-        )
-
-    for ovs in overlaps_by_line.values():
-        ovs.sort(
-            key=lambda o: (
-                int(o.get("char_lcs_len") or 0),
-                int(o.get("word_lcs_len") or 0),
-                float(o.get("char_lcs_ratio") or 0.0),
-                float(o.get("word_lcs_ratio") or 0.0),
-            ),
-            reverse=True,
-        )
-
-    top_overlap_by_line: dict[int, dict] = {}
-    for line_id, ovs in overlaps_by_line.items():
-        if ovs:
-            top_overlap_by_line[line_id] = ovs[0]
+    # The query returns each line's overlaps best first (char LCS, then word LCS, then the
+    # ratios), so the lists are already in display order and the first entry is the top one.
+    top_overlap_by_line: dict[int, dict] = {line_id: ovs[0] for line_id, ovs in overlaps_by_line.items()}
 
     # Fetch Stephanos texts for the overlap candidates we will show.
     stephanos_text_by_lemma_id: dict[int, dict] = {}
@@ -2095,7 +2734,9 @@ def main() -> None:
         try:
             sconn = get_stephanos_connection(dict_cursor=True)
             try:
-                with sconn.cursor() as cur:
+                # Server-side cursor: text bodies arrive in batches instead of one buffered result.
+                with sconn.cursor(name="stephanos_passage_texts") as cur:
+                    cur.itersize = STEPHANOS_TEXTS_ITERSIZE
                     cur.execute(
                         """
                         SELECT l.id AS lemma_id, l.lemma AS headword, l.meineke_id, v.text_body
@@ -2107,7 +2748,7 @@ def main() -> None:
                         """,
                         (lemma_ids,),
                     )
-                    for row in cur.fetchall():
+                    for row in cur:
                         stephanos_text_by_lemma_id[int(row["lemma_id"])] = {
                             "headword": row.get("headword"),
                             "meineke_id": row.get("meineke_id"),
@@ -2119,33 +2760,36 @@ def main() -> None:
             # If Stephanos DB isn't reachable, just skip embedding text.
             stephanos_text_by_lemma_id = {}
 
-    (out_dir / "passages.json").write_text(
-        json.dumps(
-            [
-                {
-                    **row,
-                    "translated_at": row["translated_at"].isoformat() if row["translated_at"] else None,
-                }
-                for row in lines
-            ],
-            ensure_ascii=False,
-            indent=2,
-        )
-        + "\n",
-        encoding="utf-8",
+    write_in_background(
+        out_dir / "passages.json",
+        _passages_json(lines) + "\n",
+        precompress=True,
+        skip_unchanged=True,
+    )
+    # Same records, one compact object per line, for streaming consumers.
+    write_in_background(
+        out_dir / "passages.jsonl",
+        "".join(json.dumps(row, ensure_ascii=False, separators=(",", ":")) + "\n" for row in lines),
+        precompress=True,
+        skip_unchanged=True,
     )
 
     site_title = _site_title("Prosodia Catholica (Herodian)")
-    (out_dir / "index.html").write_text(
-        render_index(title=site_title, stats=stats, lines=lines, top_overlap_by_line=top_overlap_by_line),
-        encoding="utf-8",
+    # One slug per passage, shared by the index links and the passage file names.
+    slugs = [ref_to_slug(row["ref"]) for row in lines]
+    write_in_background(
+        out_dir / "index.html",
+        render_index(
+            title=site_title, stats=stats, lines=lines, top_overlap_by_line=top_overlap_by_line, slugs=slugs
+        ),
+        precompress=True,
     )
 
     about_dir = out_dir / "about"
     about_dir.mkdir(parents=True, exist_ok=True)
-    (about_dir / "lentz.html").write_text(
+    write_in_background(
+        about_dir / "lentz.html",
         render_about_lentz(site_title=site_title),
-        encoding="utf-8",
     )
 
     _generate_analysis_pages(
@@ -2159,24 +2803,31 @@ def main() -> None:
         reuse_word_lcs_min=int(args.reuse_word_lcs_min),
     )
 
-    for row in lines:
-        ref = row["ref"]
-        slug = ref_to_slug(ref)
-        (passages_dir / f"{slug}.html").write_text(
-            render_passage(
-                site_title=site_title,
-                ref=ref,
-                summary=row.get("summary"),
-                greek_text=row.get("greek_text") or "",
-                english_translation=row.get("english_translation"),
-                gadget_html=row.get("gadget_html"),
-                gadget_css=row.get("gadget_css"),
-                gadget_js=row.get("gadget_js"),
-                overlaps=(overlaps_by_line.get(row["id"]) or [])[:10],
-                stephanos_text_by_lemma_id=stephanos_text_by_lemma_id,
-            ),
-            encoding="utf-8",
-        )
+    render_cache = PassageRenderCache(Path(args.render_cache)) if args.render_cache else None
+    passage_tasks = [
+        (slug, row, (overlaps_by_line.get(row["id"]) or [])[:10]) for slug, row in zip(slugs, lines)
+    ]
+    passage_context = {
+        "site_title": site_title,
+        "stephanos_text_by_lemma_id": stephanos_text_by_lemma_id,
+        "render_cache_dir": render_cache.directory if render_cache is not None else None,
+        "build_info": {"generated_at": _build_generated_at()},
+    }
+    for slug, html, used_keys in render_passages(
+        passage_tasks, context=passage_context, workers=max(1, int(args.workers))
+    ):
+        write_in_background(passages_dir / f"{slug}.html", html)
+        if render_cache is not None:
+            render_cache.used.update(used_keys)
+    if render_cache is not None:
+        render_cache.prune()
+
+    writer.shutdown(wait=True)
+    for fut in pending_writes:
+        fut.result()  # re-raise any write error
+
+    # Written last, so an interrupted build is redone on the next run.
+    write_site_file(out_dir / BUILD_STAMP_NAME, build_stamp)
 
     print(f"OK: wrote {out_dir}/index.html and {len(lines)} passage pages.")
 
@@ -25,6 +25,11 @@ CREATE TABLE IF NOT EXISTS cathpros_lines (
   translation_error TEXT
 );
 
+-- Matches the site generator's passage scan order, so it can read rows without a sort.
+CREATE INDEX IF NOT EXISTS cathpros_lines_ref_order_idx
+  ON cathpros_lines (ref_major, ref_minor, ref)
+  WHERE ref <> 'E';
+
 CREATE INDEX IF NOT EXISTS cathpros_lines_pending_idx
   ON cathpros_lines (id)
   WHERE english_translation IS NULL;
@@ -97,6 +102,17 @@ ALTER TABLE stephanos_overlap_matches ADD COLUMN IF NOT EXISTS herodian_char_end
 ALTER TABLE stephanos_overlap_matches ADD COLUMN IF NOT EXISTS stephanos_char_start INTEGER;
 ALTER TABLE stephanos_overlap_matches ADD COLUMN IF NOT EXISTS stephanos_char_end INTEGER;
 
+-- Normalized Stephanos texts, reused across overlap runs (the Stephanos database is read-only).
+CREATE TABLE IF NOT EXISTS stephanos_normalized_texts (
+  stephanos_lemma_id INTEGER PRIMARY KEY,
+  normalization_version TEXT NOT NULL,
+  text_md5 TEXT NOT NULL,
+  norm_letters TEXT NOT NULL,
+  norm_letters_map INTEGER[] NOT NULL,
+  norm_words TEXT[] NOT NULL,
+  computed_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
 -- Allow Stephanos read-only access to Herodian overlap data.
 GRANT USAGE ON SCHEMA public TO stephanos;
 GRANT SELECT ON cathpros_lines TO stephanos;
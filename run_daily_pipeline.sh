@@ -41,10 +41,11 @@ uv run summarize_lines.py --limit "$SUMMARY_LIMIT" --delay "$SUMMARY_DELAY" 2>&1
 
 GADGET_LIMIT="${GADGET_LIMIT:-1}"
 GADGET_DELAY="${GADGET_DELAY:-0}"
-export GADGET_LIMIT GADGET_DELAY
+GADGET_CONCURRENCY="${GADGET_CONCURRENCY:-4}"
+export GADGET_LIMIT GADGET_DELAY GADGET_CONCURRENCY
 
 echo "Step 2bb: generate up to ${GADGET_LIMIT} gadgets..." | tee -a "$LOGFILE"
-uv run gadgetize_lines.py --limit "$GADGET_LIMIT" --delay "$GADGET_DELAY" 2>&1 | tee -a "$LOGFILE"
+uv run gadgetize_lines.py --limit "$GADGET_LIMIT" --delay "$GADGET_DELAY" --concurrency "$GADGET_CONCURRENCY" 2>&1 | tee -a "$LOGFILE"
 
 OVERLAP_METRIC_VERSION="${OVERLAP_METRIC_VERSION:-v1}"
 OVERLAP_MAX_MATCHES="${OVERLAP_MAX_MATCHES:-10}"